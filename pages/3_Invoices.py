@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 from datetime import datetime
 import plotly.express as px
 from io import BytesIO
@@ -18,15 +18,27 @@ VISIBLE_COLUMNS = [
     "Price", "Invoice Link", "Status", "Date Created"
 ]
 
+
+@st.cache_resource
+def get_invoice_sheet(json_text):
+    creds = Credentials.from_service_account_info(
+        eval(json_text), scopes=["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    )
+    client = gspread.authorize(creds)
+    return client.open_by_key(GOOGLE_SHEET_ID).sheet1
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_invoices_df(json_text):
+    # One sheet fetch per minute instead of one per widget interaction
+    return pd.DataFrame(get_invoice_sheet(json_text).get_all_records())
+
+
 if json_file:
     try:
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(
-            eval(json_file.read()), scopes=["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        )
-        client = gspread.authorize(creds)
-        sheet = client.open_by_key(GOOGLE_SHEET_ID).sheet1
-        data = sheet.get_all_records()
-        df = pd.DataFrame(data)
+        json_text = json_file.getvalue().decode("utf-8")
+        sheet = get_invoice_sheet(json_text)
+        df = load_invoices_df(json_text).copy()
 
         df.columns = df.columns.str.strip()
         missing = [col for col in VISIBLE_COLUMNS if col not in df.columns]
@@ -34,8 +46,10 @@ if json_file:
             st.error(f"❌ Missing columns: {missing}")
             st.stop()
 
-        df = df[VISIBLE_COLUMNS]
+        df = df[VISIBLE_COLUMNS].copy()
         df["Date Created"] = pd.to_datetime(df["Date Created"], errors='coerce')
+        # Sheet cells may come back as strings; coerce once so sums and groupbys stay numeric
+        df["Price"] = pd.to_numeric(df["Price"], errors='coerce')
         df["Invoice Age (Days)"] = (datetime.today() - df["Date Created"]).dt.days
 
         st.title("📊 Invoice CRM Dashboard")
@@ -72,9 +86,9 @@ if json_file:
 
         # Charts
         if not filtered_df.empty:
-            monthly_sales = filtered_df.copy()
-            monthly_sales["Month"] = monthly_sales["Date Created"].dt.to_period("M").astype(str)
-            sales_summary = monthly_sales.groupby("Month")["Price"].sum().reset_index()
+            # Group on a derived key Series instead of copying the frame to add a column
+            month_key = filtered_df["Date Created"].dt.to_period("M").astype(str).rename("Month")
+            sales_summary = filtered_df["Price"].groupby(month_key, sort=True).sum().reset_index()
             st.subheader("📈 Monthly Sales")
             st.plotly_chart(px.bar(sales_summary, x="Month", y="Price", title="Revenue by Month"), use_container_width=True)
 
@@ -127,6 +141,7 @@ if json_file:
                         new_name, new_email, new_product, new_desc,
                         new_price, new_link, new_status, str(new_date)
                     ])
+                    load_invoices_df.clear()
                     st.success("✅ New invoice added!")
 
         # Send/Resend (Demo Only — replace with real SMTP or SendGrid logic)
@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 import json
+import hashlib
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -18,6 +19,16 @@ SHEET_COLUMNS = [
     'Start Time (12hr)', 'Start Time (24hr)', 'Meet Link', 
     'Description', 'Host', 'Unique Code', 'Upload_Timestamp'
 ]
+# Derived by prepare_events_df; not part of the sheet
+HELPER_COLUMNS = ['Upload_DT', 'Upload_Day']
+
+# Lookup tables shared across reruns
+REQUIRED_CREDENTIAL_FIELDS = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email', 'client_id']
+EVENT_STATUSES = ["Confirmed", "Pending", "Cancelled", "Completed"]
+DASHBOARD_COLUMNS = ['Name', 'Email', 'Status', 'Start Time (12hr)', 'Host', 'Event ID']
+SEARCH_COLUMNS = ['Name', 'Email', 'Event ID', 'Description']
+CONTACT_ENTRY_COLUMNS = ['Name', 'Email', 'Guest Email', 'Event ID', 'Status', 'Host']
+PAGE_OPTIONS = ["📋 Dashboard", "📅 Events", "👥 Contacts", "📈 Analytics", "➕ Add Event", "⚙️ Settings"]
 
 # ---------- Streamlit Page Settings ----------
 st.set_page_config(
@@ -69,6 +80,12 @@ st.markdown("""
 st.title("🚀 Event Management CRM")
 
 # ---------- Helper Functions ----------
+@st.cache_resource
+def get_sheets_client(creds_dict):
+    """Get an authorized gspread client, reused across reruns for the same credentials"""
+    creds = Credentials.from_service_account_info(creds_dict, scopes=SHEET_SCOPE)
+    return gspread.authorize(creds)
+
 def append_to_sheet(data_dict):
     """Append new data to Google Sheet and refresh local data"""
     try:
@@ -84,14 +101,34 @@ def append_to_sheet(data_dict):
         # Append the row
         worksheet.append_row(row_data)
         
-        # Force refresh the data immediately
-        refresh_data()
+        # Mirror the appended row locally instead of re-downloading the whole sheet
+        append_local_event(data_dict)
         
         return True, "Data added successfully!"
         
     except Exception as e:
         return False, str(e)
 
+def append_local_event(data_dict):
+    """Append a single event row to the in-memory data"""
+    new_row = prepare_events_df(pd.DataFrame([{col: data_dict.get(col, '') for col in SHEET_COLUMNS}]))
+    st.session_state.events_data = pd.concat([st.session_state.events_data, new_row], ignore_index=True)
+
+def prepare_events_df(df):
+    """Derive typed helper columns once per load instead of on every rerun"""
+    # Guarantee every sheet column exists and holds no NaN so views can index rows directly
+    for col in SHEET_COLUMNS:
+        if col not in df.columns:
+            df[col] = ''
+    df[SHEET_COLUMNS] = df[SHEET_COLUMNS].fillna('')
+    
+    if 'Upload_Timestamp' in df.columns:
+        # Timestamps are written as '%Y-%m-%d %H:%M:%S'; the ISO8601 parser skips per-value format inference
+        df['Upload_DT'] = pd.to_datetime(df['Upload_Timestamp'], format='ISO8601', errors='coerce')
+        # Midnight-normalized datetime64 day; avoids object dates from .dt.date
+        df['Upload_Day'] = df['Upload_DT'].dt.normalize()
+    return df
+
 def refresh_data():
     """Refresh data from Google Sheets"""
     if st.session_state.get('spreadsheet') is not None:
@@ -104,9 +141,9 @@ def refresh_data():
                 df = pd.DataFrame(data)
                 # Clean up the data - remove empty rows
                 df = df.dropna(how='all')
-                st.session_state.events_data = df
+                st.session_state.events_data = prepare_events_df(df)
             else:
-                st.session_state.events_data = pd.DataFrame(columns=SHEET_COLUMNS)
+                st.session_state.events_data = prepare_events_df(pd.DataFrame(columns=SHEET_COLUMNS))
                 
         except Exception as e:
             st.error(f"Error refreshing data: {str(e)}")
@@ -126,8 +163,7 @@ def load_data_from_sheets(json_credentials, sheet_url):
             creds_dict = json.load(json_credentials)
         
         # Validate required fields
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email', 'client_id']
-        missing_fields = [field for field in required_fields if field not in creds_dict]
+        missing_fields = [field for field in REQUIRED_CREDENTIAL_FIELDS if field not in creds_dict]
         
         if missing_fields:
             return None, None, f"Invalid service account JSON. Missing required fields: {', '.join(missing_fields)}"
@@ -137,8 +173,7 @@ def load_data_from_sheets(json_credentials, sheet_url):
         
         # Authenticate and connect
         try:
-            creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, SHEET_SCOPE)
-            client = gspread.authorize(creds)
+            client = get_sheets_client(creds_dict)
         except Exception as auth_error:
             return None, None, f"Authentication failed: {str(auth_error)}"
         
@@ -169,7 +204,7 @@ def load_data_from_sheets(json_credentials, sheet_url):
             else:
                 df = pd.DataFrame(columns=SHEET_COLUMNS)
             
-            return df, (client, spreadsheet), None
+            return prepare_events_df(df), (client, spreadsheet), None
             
         except Exception as e:
             return None, None, f"Error loading worksheet data: {str(e)}"
@@ -181,7 +216,7 @@ def load_data_from_sheets(json_credentials, sheet_url):
 
 def create_sample_data():
     """Create sample data matching the expected sheet structure"""
-    return pd.DataFrame({
+    return prepare_events_df(pd.DataFrame({
         'Name': ['John Doe', 'Jane Smith', 'Bob Johnson', 'Alice Brown'],
         'Email': ['john@email.com', 'jane@email.com', 'bob@email.com', 'alice@email.com'],
         'Guest Email': ['guest1@email.com', 'guest2@email.com', '', 'guest4@email.com'],
@@ -195,7 +230,7 @@ def create_sample_data():
         'Host': ['John Doe', 'Jane Smith', 'Bob Johnson', 'Alice Brown'],
         'Unique Code': ['UC001', 'UC002', 'UC003', 'UC004'],
         'Upload_Timestamp': ['2024-01-15 09:00:00', '2024-01-16 13:00:00', '2024-01-17 10:00:00', '2024-01-18 14:00:00']
-    })
+    }))
 
 # ---------- Initialize Session State ----------
 def initialize_session_state():
@@ -212,6 +247,8 @@ def initialize_session_state():
         st.session_state.spreadsheet = None
     if 'connection_status' not in st.session_state:
         st.session_state.connection_status = "sample"
+    if 'credentials_key' not in st.session_state:
+        st.session_state.credentials_key = None
 
 # ---------- Sidebar Navigation ----------
 def sidebar_navigation():
@@ -221,46 +258,51 @@ def sidebar_navigation():
     # Initialize session state
     initialize_session_state()
     
-    # Handle file upload
+    # Handle file upload; the uploader keeps returning the same file on every rerun,
+    # so only reconnect and reload the sheet when a different file is uploaded
     if json_file is not None:
-        try:
-            json_content = json_file.read()
-            
-            with st.spinner("🔄 Connecting to Google Sheets..."):
-                events_data, connection_objects, error = load_data_from_sheets(json_content, STATIC_SHEET_URL)
-            
-            if error and events_data is None:
-                # Critical error
-                st.sidebar.error("❌ Connection Failed")
-                with st.sidebar.expander("🔍 Error Details", expanded=True):
-                    st.error(f"**Error:** {error}")
+        json_content = json_file.getvalue()
+        credentials_key = hashlib.sha256(json_content).hexdigest()
+        
+        if credentials_key != st.session_state.credentials_key:
+            try:
+                with st.spinner("🔄 Connecting to Google Sheets..."):
+                    events_data, connection_objects, error = load_data_from_sheets(json_content, STATIC_SHEET_URL)
                 
+                if error and events_data is None:
+                    # Critical error
+                    st.session_state.events_data = create_sample_data()
+                    st.session_state.data_loaded = False
+                    st.session_state.error_message = error
+                    st.session_state.connection_status = "error"
+                    
+                else:
+                    # Success
+                    st.session_state.events_data = events_data
+                    st.session_state.data_loaded = True
+                    st.session_state.error_message = None
+                    st.session_state.connection_status = "connected"
+                    # Only a successful load marks this file as handled; a failed one retries on the next rerun
+                    st.session_state.credentials_key = credentials_key
+                    
+                    if connection_objects:
+                        st.session_state.client, st.session_state.spreadsheet = connection_objects
+                    
+            except Exception as e:
                 st.session_state.events_data = create_sample_data()
                 st.session_state.data_loaded = False
-                st.session_state.error_message = error
+                st.session_state.error_message = f"File processing error: {str(e)}"
                 st.session_state.connection_status = "error"
-                
-            else:
-                # Success
-                st.sidebar.success("✅ Successfully Connected!")
-                with st.sidebar.expander("📊 Connection Details"):
-                    st.success("**Status:** Connected to Google Sheets")
-                    st.info(f"**Records Found:** {len(events_data)}")
-                
-                st.session_state.events_data = events_data
-                st.session_state.data_loaded = True
-                st.session_state.error_message = None
-                st.session_state.connection_status = "connected"
-                
-                if connection_objects:
-                    st.session_state.client, st.session_state.spreadsheet = connection_objects
-                
-        except Exception as e:
-            st.sidebar.error("❌ File Processing Error")
-            st.session_state.events_data = create_sample_data()
-            st.session_state.data_loaded = False
-            st.session_state.error_message = f"File processing error: {str(e)}"
-            st.session_state.connection_status = "error"
+        
+        if st.session_state.connection_status == "connected":
+            st.sidebar.success("✅ Successfully Connected!")
+            with st.sidebar.expander("📊 Connection Details"):
+                st.success("**Status:** Connected to Google Sheets")
+                st.info(f"**Records Found:** {len(st.session_state.events_data)}")
+        elif st.session_state.connection_status == "error":
+            st.sidebar.error("❌ Connection Failed")
+            with st.sidebar.expander("🔍 Error Details", expanded=True):
+                st.error(f"**Error:** {st.session_state.error_message}")
     
     # Add refresh button for connected sheets
     if st.session_state.connection_status == "connected":
@@ -272,10 +314,7 @@ def sidebar_navigation():
     
     st.sidebar.markdown("---")
     st.sidebar.header("📊 Navigation")
-    page = st.sidebar.selectbox(
-        "Select Page",
-        ["📋 Dashboard", "📅 Events", "👥 Contacts", "📈 Analytics", "➕ Add Event", "⚙️ Settings"]
-    )
+    page = st.sidebar.selectbox("Select Page", PAGE_OPTIONS)
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("✅ **Data Source:**")
@@ -298,6 +337,10 @@ def show_dashboard():
     
     events_data = st.session_state.events_data
     
+    # Count every status in one pass instead of filtering the frame per metric
+    has_status = 'Status' in events_data.columns
+    status_counts = events_data['Status'].value_counts() if has_status else pd.Series(dtype='int64')
+    
     # Create metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -306,14 +349,12 @@ def show_dashboard():
         st.metric("📅 Total Events", total_events)
     
     with col2:
-        if 'Status' in events_data.columns:
-            confirmed_count = len(events_data[events_data['Status'] == 'Confirmed'])
-            st.metric("✅ Confirmed", confirmed_count)
+        if has_status:
+            st.metric("✅ Confirmed", int(status_counts.get('Confirmed', 0)))
     
     with col3:
-        if 'Status' in events_data.columns:
-            pending_count = len(events_data[events_data['Status'] == 'Pending'])
-            st.metric("⏳ Pending", pending_count)
+        if has_status:
+            st.metric("⏳ Pending", int(status_counts.get('Pending', 0)))
     
     with col4:
         unique_hosts = events_data['Host'].nunique() if 'Host' in events_data.columns else 0
@@ -342,8 +383,7 @@ def show_dashboard():
         recent_events = events_data.head(10)
         
         # Display key columns
-        display_cols = ['Name', 'Email', 'Status', 'Start Time (12hr)', 'Host', 'Event ID']
-        available_cols = [col for col in display_cols if col in recent_events.columns]
+        available_cols = [col for col in DASHBOARD_COLUMNS if col in recent_events.columns]
         
         st.dataframe(recent_events[available_cols], use_container_width=True)
     else:
@@ -382,9 +422,8 @@ def show_events():
         
         if search_term:
             # Search across multiple columns
-            search_cols = ['Name', 'Email', 'Event ID', 'Description']
             mask = False
-            for col in search_cols:
+            for col in SEARCH_COLUMNS:
                 if col in filtered_data.columns:
                     mask |= filtered_data[col].astype(str).str.contains(search_term, case=False, na=False)
             filtered_data = filtered_data[mask]
@@ -393,28 +432,34 @@ def show_events():
         
         if len(filtered_data) > 0:
             # Display with expandable rows for full details
-            for idx, row in filtered_data.iterrows():
-                with st.expander(f"🎯 {row.get('Name', 'N/A')} - {row.get('Event ID', 'N/A')} ({row.get('Status', 'N/A')})"):
+            for row in filtered_data.to_dict('records'):
+                with st.expander(f"🎯 {row['Name']} - {row['Event ID']} ({row['Status']})"):
                     col1, col2 = st.columns(2)
                     
+                    # One markdown block per column keeps the element count per event low
                     with col1:
-                        st.write(f"**Name:** {row.get('Name', 'N/A')}")
-                        st.write(f"**Email:** {row.get('Email', 'N/A')}")
-                        st.write(f"**Guest Email:** {row.get('Guest Email', 'N/A')}")
-                        st.write(f"**Status:** {row.get('Status', 'N/A')}")
-                        st.write(f"**Event ID:** {row.get('Event ID', 'N/A')}")
-                        st.write(f"**Host:** {row.get('Host', 'N/A')}")
+                        st.markdown("  \n".join([
+                            f"**Name:** {row['Name']}",
+                            f"**Email:** {row['Email']}",
+                            f"**Guest Email:** {row['Guest Email']}",
+                            f"**Status:** {row['Status']}",
+                            f"**Event ID:** {row['Event ID']}",
+                            f"**Host:** {row['Host']}",
+                        ]))
                     
                     with col2:
-                        st.write(f"**Start Time (12hr):** {row.get('Start Time (12hr)', 'N/A')}")
-                        st.write(f"**Start Time (24hr):** {row.get('Start Time (24hr)', 'N/A')}")
-                        if row.get('Meet Link'):
-                            st.write(f"**Meet Link:** [Join Meeting]({row.get('Meet Link')})")
-                        st.write(f"**Unique Code:** {row.get('Unique Code', 'N/A')}")
-                        st.write(f"**Upload Timestamp:** {row.get('Upload_Timestamp', 'N/A')}")
+                        details = [
+                            f"**Start Time (12hr):** {row['Start Time (12hr)']}",
+                            f"**Start Time (24hr):** {row['Start Time (24hr)']}",
+                        ]
+                        if row['Meet Link']:
+                            details.append(f"**Meet Link:** [Join Meeting]({row['Meet Link']})")
+                        details.append(f"**Unique Code:** {row['Unique Code']}")
+                        details.append(f"**Upload Timestamp:** {row['Upload_Timestamp']}")
+                        st.markdown("  \n".join(details))
                         
-                    if row.get('Description'):
-                        st.write(f"**Description:** {row.get('Description', 'N/A')}")
+                    if row['Description']:
+                        st.write(f"**Description:** {row['Description']}")
         else:
             st.info("No events match the current filters")
     else:
@@ -426,30 +471,24 @@ def show_contacts():
     events_data = st.session_state.events_data
     
     if len(events_data) > 0:
-        # Extract unique contacts
-        contacts = []
-        for _, row in events_data.iterrows():
+        # Extract unique contacts with column masks instead of walking every row
+        contact_frames = []
+        if 'Name' in events_data.columns and 'Email' in events_data.columns:
             # Main contact
-            if row.get('Name') and row.get('Email'):
-                contacts.append({
-                    'Name': row.get('Name'),
-                    'Email': row.get('Email'),
-                    'Type': 'Primary',
-                    'Events': 1
-                })
-            
+            has_contact = events_data['Name'].astype(bool) & events_data['Email'].astype(bool)
+            primary = events_data.loc[has_contact, ['Name', 'Email']]
+            contact_frames.append(primary.assign(Type='Primary', Events=1))
+        
+        if 'Guest Email' in events_data.columns:
             # Guest contact
-            if row.get('Guest Email'):
-                contacts.append({
-                    'Name': 'Guest',
-                    'Email': row.get('Guest Email'),
-                    'Type': 'Guest',
-                    'Events': 1
-                })
-        
-        if contacts:
-            contacts_df = pd.DataFrame(contacts)
-            
+            guests = events_data.loc[events_data['Guest Email'].astype(bool), ['Guest Email']]
+            contact_frames.append(
+                guests.rename(columns={'Guest Email': 'Email'}).assign(Name='Guest', Type='Guest', Events=1)
+            )
+        
+        contacts_df = pd.concat(contact_frames, ignore_index=True) if contact_frames else pd.DataFrame()
+        
+        if not contacts_df.empty:
             # Aggregate by email
             contacts_summary = contacts_df.groupby(['Name', 'Email', 'Type']).agg({
                 'Events': 'sum'
@@ -458,64 +497,91 @@ def show_contacts():
             st.subheader(f"📋 Contacts Summary ({len(contacts_summary)} unique contacts)")
             st.dataframe(contacts_summary, use_container_width=True)
             
-            # Contact details
+            # Contact details as one read-only table instead of an expander per row
             st.subheader("📧 All Contact Entries")
-            for _, row in events_data.iterrows():
-                with st.expander(f"📧 {row.get('Name', 'N/A')} ({row.get('Email', 'N/A')})"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write(f"**Name:** {row.get('Name', 'N/A')}")
-                        st.write(f"**Email:** {row.get('Email', 'N/A')}")
-                        st.write(f"**Guest Email:** {row.get('Guest Email', 'N/A')}")
-                    with col2:
-                        st.write(f"**Event ID:** {row.get('Event ID', 'N/A')}")
-                        st.write(f"**Status:** {row.get('Status', 'N/A')}")
-                        st.write(f"**Host:** {row.get('Host', 'N/A')}")
+            entry_cols = [col for col in CONTACT_ENTRY_COLUMNS if col in events_data.columns]
+            st.dataframe(events_data[entry_cols], use_container_width=True, hide_index=True)
         else:
             st.info("No contact information available")
     else:
         st.info("No contacts data available")
 
+# Figures are cached on their plotted values so unchanged data skips Plotly construction
+@st.cache_data
+def build_status_pie(labels, values):
+    """Build the event status pie chart"""
+    return px.pie(values=list(values), names=list(labels), title="Event Status Distribution")
+
+@st.cache_data
+def build_host_bar(hosts, counts):
+    """Build the top hosts bar chart"""
+    return px.bar(x=list(counts), y=list(hosts), orientation='h', title="Top 10 Hosts by Event Count")
+
+@st.cache_data
+def build_timeline_line(days, counts):
+    """Build the events-over-time line chart"""
+    return px.line(x=list(days), y=list(counts),
+                   title="Events Created Over Time",
+                   labels={'x': 'Date', 'y': 'Number of Events'})
+
+@st.cache_data
+def compute_event_analytics(events_data):
+    """Aggregate everything the analytics view shows; cached on the events frame contents"""
+    # factorize + bincount counts statuses in one linear pass over integer codes
+    status_codes, status_labels = pd.factorize(events_data['Status'])
+    status_counts = np.bincount(status_codes[status_codes >= 0], minlength=len(status_labels))
+    
+    host_counts = events_data['Host'].value_counts().head(10)
+    
+    return {
+        'status': (tuple(status_labels), tuple(status_counts.tolist())),
+        'hosts': (tuple(host_counts.index), tuple(host_counts.tolist())),
+        'unique_hosts': int(events_data['Host'].nunique()),
+        'unique_emails': int(events_data['Email'].nunique()),
+    }
+
+@st.cache_data
+def compute_event_timeline(events_data):
+    """Events per upload day for the timeline chart; cached on the events frame contents"""
+    # Upload_Day is derived once at load time by prepare_events_df; bin whole-day
+    # offsets from the first day instead of hashing timestamps with value_counts
+    upload_days = events_data['Upload_Day'].dropna().values.astype('datetime64[D]')
+    if len(upload_days):
+        first_day = upload_days.min()
+        day_counts = np.bincount((upload_days - first_day).astype('int64'))
+        active_offsets = np.flatnonzero(day_counts)
+        timeline_days = first_day + active_offsets.astype('timedelta64[D]')
+        timeline_counts = day_counts[active_offsets]
+    else:
+        timeline_days, timeline_counts = [], np.array([], dtype='int64')
+    
+    return tuple(pd.to_datetime(timeline_days)), tuple(timeline_counts.tolist())
+
 def show_analytics():
     st.header("📈 Analytics")
     
     events_data = st.session_state.events_data
     
     if len(events_data) > 0:
+        # Unchanged data is a cache hit, so reruns skip every aggregation below
+        analytics = compute_event_analytics(events_data)
+        
         col1, col2 = st.columns(2)
         
         with col1:
             # Status distribution
-            if 'Status' in events_data.columns:
-                status_counts = events_data['Status'].value_counts()
-                fig = px.pie(values=status_counts.values, names=status_counts.index, 
-                           title="Event Status Distribution")
-                st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_status_pie(*analytics['status']), use_container_width=True)
         
         with col2:
             # Host distribution
-            if 'Host' in events_data.columns:
-                host_counts = events_data['Host'].value_counts().head(10)
-                fig = px.bar(x=host_counts.values, y=host_counts.index, 
-                           orientation='h', title="Top 10 Hosts by Event Count")
-                st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_host_bar(*analytics['hosts']), use_container_width=True)
         
         # Timeline analysis
-        if 'Upload_Timestamp' in events_data.columns:
-            st.subheader("📅 Events Timeline")
-            try:
-                # Convert timestamp to datetime
-                events_data['Upload_Date'] = pd.to_datetime(events_data['Upload_Timestamp'], errors='coerce')
-                events_data['Upload_Date'] = events_data['Upload_Date'].dt.date
-                
-                timeline_counts = events_data['Upload_Date'].value_counts().sort_index()
-                
-                fig = px.line(x=timeline_counts.index, y=timeline_counts.values,
-                            title="Events Created Over Time",
-                            labels={'x': 'Date', 'y': 'Number of Events'})
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error creating timeline: {str(e)}")
+        st.subheader("📅 Events Timeline")
+        try:
+            st.plotly_chart(build_timeline_line(*compute_event_timeline(events_data)), use_container_width=True)
+        except Exception as e:
+            st.error(f"Error creating timeline: {str(e)}")
         
         # Summary statistics
         st.subheader("📊 Summary Statistics")
@@ -525,14 +591,10 @@ def show_analytics():
             st.metric("Total Events", len(events_data))
         
         with col2:
-            if 'Host' in events_data.columns:
-                unique_hosts = events_data['Host'].nunique()
-                st.metric("Unique Hosts", unique_hosts)
+            st.metric("Unique Hosts", analytics['unique_hosts'])
         
         with col3:
-            if 'Email' in events_data.columns:
-                unique_emails = events_data['Email'].nunique()
-                st.metric("Unique Participants", unique_emails)
+            st.metric("Unique Participants", analytics['unique_emails'])
     else:
         st.info("No data available for analytics")
 
@@ -546,7 +608,7 @@ def show_add_event():
             name = st.text_input("Name*")
             email = st.text_input("Email*")
             guest_email = st.text_input("Guest Email (optional)")
-            status = st.selectbox("Status", ["Confirmed", "Pending", "Cancelled", "Completed"])
+            status = st.selectbox("Status", EVENT_STATUSES)
             event_id = st.text_input("Event ID*")
             unique_code = st.text_input("Unique Code*")
         
@@ -586,8 +648,7 @@ def show_add_event():
                 else:
                     st.warning("Google Sheets not connected. Event added to local data only.")
                     # Add to local data
-                    new_row = pd.DataFrame([new_event])
-                    st.session_state.events_data = pd.concat([st.session_state.events_data, new_row], ignore_index=True)
+                    append_local_event(new_event)
                     st.success("Event added to local data!")
                     st.rerun()
             else:
@@ -598,9 +659,7 @@ def show_settings():
     
     st.subheader("📋 Expected Sheet Structure")
     st.write("Your Google Sheet should have the following columns in this exact order:")
-    
-    for i, col in enumerate(SHEET_COLUMNS, 1):
-        st.write(f"{i}. **{col}**")
+    st.markdown("\n".join(f"{i}. **{col}**" for i, col in enumerate(SHEET_COLUMNS, 1)))
     
     st.subheader("🔗 Current Configuration")
     st.code(f"Sheet URL: {STATIC_SHEET_URL}")
@@ -613,19 +672,27 @@ def show_settings():
         st.info("💻 Using sample data")
     
     # Show current data columns
-    if len(st.session_state.events_data) > 0:
+    sheet_data = st.session_state.events_data.drop(columns=HELPER_COLUMNS, errors='ignore')
+    if len(sheet_data) > 0:
         st.subheader("📋 Available Columns in Data")
-        cols = list(st.session_state.events_data.columns)
-        for col in cols:
-            st.write(f"• {col}")
+        st.markdown("\n".join(f"- {col}" for col in sheet_data.columns))
     
     # Data preview
     st.subheader("👀 Data Preview")
-    if len(st.session_state.events_data) > 0:
-        st.dataframe(st.session_state.events_data.head(), use_container_width=True)
+    if len(sheet_data) > 0:
+        st.dataframe(sheet_data.head(), use_container_width=True)
     else:
         st.info("No data to preview")
 
+PAGE_RENDERERS = {
+    "📋 Dashboard": show_dashboard,
+    "📅 Events": show_events,
+    "👥 Contacts": show_contacts,
+    "📈 Analytics": show_analytics,
+    "➕ Add Event": show_add_event,
+    "⚙️ Settings": show_settings,
+}
+
 # ---------- Main Application ----------
 def main():
     # Get current page from sidebar
@@ -642,18 +709,9 @@ def main():
         st.markdown("---")
     
     # Route to appropriate page
-    if current_page == "📋 Dashboard":
-        show_dashboard()
-    elif current_page == "📅 Events":
-        show_events()
-    elif current_page == "👥 Contacts":
-        show_contacts()
-    elif current_page == "📈 Analytics":
-        show_analytics()
-    elif current_page == "➕ Add Event":
-        show_add_event()
-    elif current_page == "⚙️ Settings":
-        show_settings()
+    page_renderer = PAGE_RENDERERS.get(current_page)
+    if page_renderer:
+        page_renderer()
 
 # ---------- Run Application ----------
 if __name__ == "__main__":
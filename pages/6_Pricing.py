@@ -1,30 +1,106 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 from io import BytesIO
+from html import escape
 from fpdf import FPDF
 
 # Constants
 SHEET_ID = "1WeDpcSNnfCrtx4F3bBC9osigPkzy3LXybRO6jpN7BXE"
 VISIBLE_COLUMNS = ["Service Category", "Item", "Price (USD)", "Turnaround Time", "Notes"]
+CARD_GRID_STYLE = "display:grid;grid-template-columns:repeat(3,1fr);gap:1rem;margin-bottom:1rem;"
+CARD_TEMPLATE = (
+    '<div style="border:1px solid #e0e0e0;border-radius:10px;padding:1rem;">'
+    '<div style="font-size:0.8rem;color:#666;">{category} · Row #{sheet_row}</div>'
+    '<h4 style="margin:0.25rem 0;">🔹 {item}</h4>'
+    '<div style="font-size:1.4rem;font-weight:bold;">{price}</div>'
+    '<div>⏱️ {turnaround}</div>'
+    '<div style="font-size:0.85rem;color:#444;">{notes}</div>'
+    '</div>'
+)
 
 st.set_page_config(page_title="💼 Pricing & Services - Cards View", layout="wide")
 
 # --- Utilities ---
 
-def load_gsheet_data(json_data, sheet_id):
+@st.cache_resource
+def get_worksheet(json_data, sheet_id):
     scope = ["https://spreadsheets.google.com/feeds",
              "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(json_data, scope)
+    creds = Credentials.from_service_account_info(json_data, scopes=scope)
     client = gspread.authorize(creds)
     sheet = client.open_by_key(sheet_id)
-    worksheet = sheet.get_worksheet(0)
+    return sheet.get_worksheet(0)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_pricing_df(json_data, sheet_id):
+    # Widget interactions rerun the script; serve the sheet from cache instead of refetching
+    worksheet = get_worksheet(json_data, sheet_id)
     df = pd.DataFrame(worksheet.get_all_records())
-    return worksheet, df
+    df.columns = df.columns.str.strip()
+    df = df[VISIBLE_COLUMNS].copy()
+    # Few distinct categories: integer codes make filtering and counting cheap
+    df["Service Category"] = df["Service Category"].astype("category")
+    # Parse prices once per load; blank or malformed cells become NaN
+    df["Price (USD)"] = pd.to_numeric(df["Price (USD)"], errors="coerce")
+    # Lower-cased search keys, computed once per load rather than per row on every search
+    df["_item_lower"] = df["Item"].astype(str).str.lower()
+    df["_notes_lower"] = df["Notes"].astype(str).str.lower()
+    # Sheet row for each record (header is row 1, data start at 2), used by cards and edits
+    df["_sheet_row"] = df.index + 2
+    return df
+
+
+def filter_pricing_df(df, category, term):
+    # Not cached: filtering the frame loaded in this run keeps rows and _sheet_row numbers in step
+    mask = pd.Series(True, index=df.index)
+    if category != "All":
+        # Compare integer category codes rather than the string labels
+        categories = df["Service Category"].cat.categories
+        code = categories.get_loc(category) if category in categories else -2
+        mask &= df["Service Category"].cat.codes.to_numpy() == code
+    if term:
+        mask &= (
+            df["_item_lower"].str.contains(term, regex=False)
+            | df["_notes_lower"].str.contains(term, regex=False)
+        )
+    # Nothing filtered out: hand back the loaded frame instead of a copy
+    return df if mask.all() else df[mask]
+
+
+def clear_pricing_cache():
+    load_pricing_df.clear()
+
+
+def load_gsheet_data(json_data, sheet_id):
+    return get_worksheet(json_data, sheet_id), load_pricing_df(json_data, sheet_id)
+
+
+def service_card_html(sheet_row, category, item, price, turnaround, notes) -> str:
+    return CARD_TEMPLATE.format_map({
+        "sheet_row": sheet_row,
+        "category": escape(str(category)),
+        "item": escape(str(item)),
+        "price": "—" if pd.isna(price) else f"${price:,.2f}",
+        "turnaround": escape(str(turnaround)),
+        "notes": escape(str(notes)),
+    })
+
+
+@st.cache_data(show_spinner=False)
+def export_csv(df: pd.DataFrame) -> bytes:
+    # Write straight into a bytes buffer rather than building a str and encoding it
+    buffer = BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8")
+    return buffer.getvalue()
 
 
+@st.cache_data(show_spinner=False)
 def export_pdf(df: pd.DataFrame) -> bytes:
+    # Cached on the frame contents so reruns with unchanged filters skip FPDF layout
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=10)
@@ -58,6 +134,109 @@ def delete_row(worksheet, row_number):
     worksheet.delete_rows(row_number)
 
 
+# --- Views ---
+
+def show_service_items(worksheet, filtered_df):
+    st.markdown("### 📌 Service Items")
+
+    if filtered_df.empty:
+        st.info("No services match the current filters.")
+    else:
+        # All cards go out in one markdown element laid out by a CSS grid
+        # Plain tuples straight from the column arrays, no Series built per card
+        cards = [
+            service_card_html(*card)
+            for card in filtered_df[["_sheet_row", *VISIBLE_COLUMNS]].itertuples(index=False, name=None)
+        ]
+        st.markdown(f'<div style="{CARD_GRID_STYLE}">{"".join(cards)}</div>', unsafe_allow_html=True)
+
+        # Only the selected service gets an edit form, instead of one form per card
+        st.markdown("### ✏️ Edit or Delete a Service")
+        row_labels = {
+            idx: f"🔹 {category} - {item} (Row #{sheet_row})"
+            for idx, category, item, sheet_row in zip(
+                filtered_df.index, filtered_df["Service Category"], filtered_df["Item"], filtered_df["_sheet_row"]
+            )
+        }
+        selected_idx = st.selectbox("Select a service", list(row_labels), format_func=row_labels.get)
+        # Plain dict: the form reads six fields and Series label lookups are comparatively slow
+        row = filtered_df.loc[selected_idx].to_dict()
+        sheet_row_num = int(row["_sheet_row"])
+
+        # Display fields for edit inside a form
+        with st.form(f"edit_form_{sheet_row_num}"):
+            col1, col2 = st.columns(2)
+            category = col1.text_input("Service Category", value=row["Service Category"], key=f"cat_{sheet_row_num}")
+            item = col2.text_input("Item", value=row["Item"], key=f"item_{sheet_row_num}")
+            current_price = 0.0 if pd.isna(row["Price (USD)"]) else float(row["Price (USD)"])
+            price = st.number_input("Price (USD)", min_value=0.0, value=current_price, format="%.2f", key=f"price_{sheet_row_num}")
+            turnaround = st.text_input("Turnaround Time", value=row["Turnaround Time"], key=f"turn_{sheet_row_num}")
+            notes = st.text_area("Notes", value=row["Notes"], key=f"notes_{sheet_row_num}")
+
+            update_btn = st.form_submit_button("🔄 Update this Service")
+            delete_btn = st.form_submit_button("❌ Delete this Service")
+
+            if update_btn:
+                try:
+                    values = [category, item, price, turnaround, notes]
+                    update_row(worksheet, sheet_row_num, values)
+                    clear_pricing_cache()
+                    st.success(f"Row #{sheet_row_num} updated successfully. Please refresh to see changes.")
+                except Exception as e:
+                    st.error(f"Failed to update row {sheet_row_num}: {e}")
+
+            if delete_btn:
+                try:
+                    delete_row(worksheet, sheet_row_num)
+                    clear_pricing_cache()
+                    st.warning(f"Row #{sheet_row_num} deleted. Please refresh to update the view.")
+                except Exception as e:
+                    st.error(f"Failed to delete row {sheet_row_num}: {e}")
+
+
+def show_add_service(worksheet, filtered_df):
+    st.subheader("➕ Add New Service")
+    with st.form("add_service_form"):
+        col1, col2 = st.columns(2)
+        new_category = col1.text_input("Service Category")
+        new_item = col2.text_input("Item")
+        new_price = st.number_input("Price (USD)", min_value=0.0, format="%.2f")
+        new_turnaround = st.text_input("Turnaround Time")
+        new_notes = st.text_area("Notes")
+        submit_add = st.form_submit_button("✅ Add Service")
+
+        if submit_add:
+            if not new_category or not new_item:
+                st.error("Service Category and Item are required.")
+            else:
+                try:
+                    add_service(worksheet, [new_category, new_item, new_price, new_turnaround, new_notes])
+                    clear_pricing_cache()
+                    st.success("Service added successfully! Please refresh the app to see the latest data.")
+                except Exception as e:
+                    st.error(f"Failed to add service: {e}")
+
+
+def show_export(worksheet, filtered_df):
+    st.subheader("📤 Export Filtered Data")
+    col_csv, col_pdf = st.columns(2)
+    with col_csv:
+        csv_bytes = export_csv(filtered_df[VISIBLE_COLUMNS])
+        st.download_button("⬇️ Download CSV", csv_bytes, "services.csv", "text/csv")
+
+    with col_pdf:
+        pdf_bytes = export_pdf(filtered_df[VISIBLE_COLUMNS])
+        st.download_button("🖨️ Download PDF", pdf_bytes, "services.pdf", "application/pdf")
+
+
+# Only the selected view runs; st.tabs would execute every section on each rerun
+PRICING_VIEWS = {
+    "📌 Service Items": show_service_items,
+    "➕ Add Service": show_add_service,
+    "📤 Export": show_export,
+}
+
+
 # --- Main App ---
 
 def main():
@@ -84,98 +263,29 @@ def main():
         st.error(f"❌ Error loading Google Sheet: {e}")
         return
 
-    df.columns = df.columns.str.strip()
-    df = df[VISIBLE_COLUMNS]
-
     # KPIs
+    # One reduction over the raw price array; the category count comes from the dtype
+    prices = df["Price (USD)"].to_numpy(dtype=float)
+    priced = ~np.isnan(prices)
+    priced_count = int(priced.sum())
+    avg_price = prices[priced].sum() / priced_count if priced_count else 0.0
     k1, k2, k3 = st.columns(3)
-    k1.metric("🧾 Total Services", len(df))
-    avg_price = df["Price (USD)"].mean()
-    k2.metric("💲 Avg. Price (USD)", f"${avg_price:.2f}" if not pd.isna(avg_price) else "$0.00")
-    k3.metric("🗂️ Categories", df["Service Category"].nunique())
+    k1.metric("🧾 Total Services", prices.size)
+    k2.metric("💲 Avg. Price (USD)", f"${avg_price:.2f}")
+    k3.metric("🗂️ Categories", len(df["Service Category"].cat.categories))
     st.markdown("---")
 
     # Filters
     st.subheader("🔍 Filter Services")
-    categories = ["All"] + sorted(df["Service Category"].unique())
+    # Categories come out of astype("category") already sorted; no scan of the column needed
+    categories = ["All"] + df["Service Category"].cat.categories.tolist()
     selected_cat = st.selectbox("Filter by Category", categories)
-    filtered_df = df.copy()
-    if selected_cat != "All":
-        filtered_df = filtered_df[filtered_df["Service Category"] == selected_cat]
-
     search_term = st.text_input("Search Item or Notes")
-    if search_term:
-        mask = filtered_df.apply(lambda r: search_term.lower() in str(r["Item"]).lower()
-                                            or search_term.lower() in str(r["Notes"]).lower(), axis=1)
-        filtered_df = filtered_df[mask]
-
-    st.markdown("### 📌 Service Items")
-
-    # Show each item in an expander card for details + inline editing
-    for idx, row in filtered_df.iterrows():
-        # Calculate row number in sheet (header is row 1, data start at 2)
-        sheet_row_num = idx + 2
-        with st.expander(f"🔹 {row['Service Category']} - {row['Item']} (Row #{sheet_row_num})", expanded=False):
-
-            # Display fields for edit inside a form
-            with st.form(f"edit_form_{sheet_row_num}"):
-                col1, col2 = st.columns(2)
-                category = col1.text_input("Service Category", value=row["Service Category"], key=f"cat_{sheet_row_num}")
-                item = col2.text_input("Item", value=row["Item"], key=f"item_{sheet_row_num}")
-                price = st.number_input("Price (USD)", min_value=0.0, value=float(row["Price (USD)"]), format="%.2f", key=f"price_{sheet_row_num}")
-                turnaround = st.text_input("Turnaround Time", value=row["Turnaround Time"], key=f"turn_{sheet_row_num}")
-                notes = st.text_area("Notes", value=row["Notes"], key=f"notes_{sheet_row_num}")
-
-                update_btn = st.form_submit_button("🔄 Update this Service")
-                delete_btn = st.form_submit_button("❌ Delete this Service")
-
-                if update_btn:
-                    try:
-                        values = [category, item, price, turnaround, notes]
-                        update_row(worksheet, sheet_row_num, values)
-                        st.success(f"Row #{sheet_row_num} updated successfully. Please refresh to see changes.")
-                    except Exception as e:
-                        st.error(f"Failed to update row {sheet_row_num}: {e}")
-
-                if delete_btn:
-                    try:
-                        delete_row(worksheet, sheet_row_num)
-                        st.warning(f"Row #{sheet_row_num} deleted. Please refresh to update the view.")
-                    except Exception as e:
-                        st.error(f"Failed to delete row {sheet_row_num}: {e}")
+    filtered_df = filter_pricing_df(df, selected_cat, search_term.lower())
 
     st.markdown("---")
-    st.subheader("➕ Add New Service")
-    with st.form("add_service_form"):
-        col1, col2 = st.columns(2)
-        new_category = col1.text_input("Service Category")
-        new_item = col2.text_input("Item")
-        new_price = st.number_input("Price (USD)", min_value=0.0, format="%.2f")
-        new_turnaround = st.text_input("Turnaround Time")
-        new_notes = st.text_area("Notes")
-        submit_add = st.form_submit_button("✅ Add Service")
-
-        if submit_add:
-            if not new_category or not new_item:
-                st.error("Service Category and Item are required.")
-            else:
-                try:
-                    add_service(worksheet, [new_category, new_item, new_price, new_turnaround, new_notes])
-                    st.success("Service added successfully! Please refresh the app to see the latest data.")
-                except Exception as e:
-                    st.error(f"Failed to add service: {e}")
-
-    # Export buttons
-    st.markdown("---")
-    st.subheader("📤 Export Filtered Data")
-    col_csv, col_pdf = st.columns(2)
-    with col_csv:
-        csv_bytes = filtered_df.to_csv(index=False).encode("utf-8")
-        st.download_button("⬇️ Download CSV", csv_bytes, "services.csv", "text/csv")
-
-    with col_pdf:
-        pdf_bytes = export_pdf(filtered_df)
-        st.download_button("🖨️ Download PDF", pdf_bytes, "services.pdf", "application/pdf")
+    view = st.radio("View", list(PRICING_VIEWS), horizontal=True, key="pricing_view")
+    PRICING_VIEWS[view](worksheet, filtered_df)
 
     st.caption("💡 Please refresh the app (F5) after adding, updating, or deleting services to reload.")
 
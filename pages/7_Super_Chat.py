@@ -1,9 +1,13 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import re
+import heapq
+import gc
 import json
-import hashlib
+import orjson
+import secrets
 import pickle
 import os
 from typing import List, Dict, Optional
@@ -16,6 +20,8 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
 from google.auth.transport.requests import Request
 import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # ----------------------------
 # Configuration
@@ -23,7 +29,25 @@ import tempfile
 CHAT_HISTORY_FILE = "chat_sessions.pkl"
 CHAT_HISTORY_JSON = "chat_sessions.json"
 MAX_CHAT_HISTORY = 100
+VISIBLE_MESSAGE_COUNT = 30
+RECENT_SESSIONS_SHOWN = 10
+# Characters that need the markdown renderer; messages without them take the st.html fast path
+MARKDOWN_CHARS = frozenset("*_`[]#<>&~|\\\n")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+USER_ROLES = ("Visitor", "Customer", "Manager", "Technician", "Admin")
 DEFAULT_N8N_WEBHOOK = "https://agentonline-u29564.vm.elestio.app/webhook/f4927f0d-167b-4ab0-94d2-87d4c373f9e9"
+# (connect, read) seconds: an unreachable webhook fails fast, slow generations still get time
+WEBHOOK_TIMEOUT = (5, 45)
+STREAM_FLUSH_INTERVAL = 0.05  # seconds between streamed UI updates
+# n8n stream messages that frame the "item" chunks and carry no text
+STREAM_CONTROL_TYPES = ("begin", "end")
+EMPTY_AI_RESPONSE = "🤔 I received your message but couldn't generate a proper response. Could you try rephrasing?"
+
+# Each keystroke reruns the page and allocates many short-lived dicts and strings;
+# a higher gen0 threshold keeps those from triggering frequent collections.
+# Set CHAT_GC_TUNING=false to keep the interpreter defaults.
+if os.getenv("CHAT_GC_TUNING", "true").lower() == "true":
+    gc.set_threshold(50_000, 10, 10)
 
 # Google Drive Configuration
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
@@ -137,8 +161,8 @@ class GoogleDriveManager:
             st.error(f"Folder creation error: {str(e)}")
             return None
     
-    def upload_sessions(self, sessions_data: Dict, filename: str = None) -> bool:
-        """Upload chat sessions to Google Drive"""
+    def upload_sessions(self, sessions_data: Dict, filename: str = None, report_errors: bool = True) -> bool:
+        """Upload chat sessions to Google Drive; with report_errors=False failures are raised instead"""
         try:
             if not self.service or not self.folder_id:
                 return False
@@ -147,7 +171,7 @@ class GoogleDriveManager:
                 filename = f"chat_sessions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
             # Convert sessions to JSON format
-            json_data = json.dumps(sessions_data, indent=2, default=str)
+            json_data = dumps_json(sessions_data)
             
             # Create file metadata
             file_metadata = {
@@ -157,7 +181,7 @@ class GoogleDriveManager:
             
             # Upload file
             media = MediaIoBaseUpload(
-                io.BytesIO(json_data.encode()),
+                io.BytesIO(json_data),
                 mimetype='application/json'
             )
             
@@ -188,6 +212,8 @@ class GoogleDriveManager:
             return True
             
         except Exception as e:
+            if not report_errors:
+                raise
             st.error(f"Upload error: {str(e)}")
             return False
     
@@ -241,13 +267,38 @@ class GoogleDriveManager:
 def get_drive_manager():
     return GoogleDriveManager()
 
+def get_save_executor() -> ThreadPoolExecutor:
+    """Per-session single worker: saves stay in order and never queue behind other users'"""
+    if "save_executor" not in st.session_state:
+        st.session_state.save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-io")
+    return st.session_state.save_executor
+
+def dumps_json(data) -> bytes:
+    """Serialize to indented JSON bytes, stringifying unsupported types"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+
+# Pooled HTTP session so each chat turn reuses the open connection to the webhook
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    session = requests.Session()
+    # No retries: an unreachable webhook fails within the connect timeout, and a POST
+    # that reached n8n is never resent
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 # ----------------------------
 # Utility Functions
 # ----------------------------
+HTML_TAG_PATTERN = re.compile('<.*?>')
+
 def strip_html_tags(text):
     """Remove HTML tags from text"""
-    clean = re.compile('<.*?>')
-    return re.sub(clean, '', text)
+    # Most chunks carry no markup; skip the regex scan when there is no tag opener
+    if '<' not in text:
+        return text
+    return HTML_TAG_PATTERN.sub('', text)
 
 def extract_plain_text(response_text):
     """Extract plain text message from AI response"""
@@ -275,30 +326,86 @@ def extract_plain_text(response_text):
     
     return strip_html_tags(str(response_text))
 
-def generate_session_id(user_info: Dict) -> str:
-    """Generate a unique session ID based on user info and timestamp"""
-    base_string = f"{user_info['name']}_{user_info['role']}_{user_info['team']}"
-    return hashlib.md5(base_string.encode()).hexdigest()[:12]
+def coalesce_stream(chunks, min_interval: float = STREAM_FLUSH_INTERVAL):
+    """Merge streamed chunks so the UI updates at most once per interval"""
+    buffer = []
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= min_interval:
+            yield ''.join(buffer)
+            buffer.clear()
+            last_flush = now
+    if buffer:
+        yield ''.join(buffer)
 
-def save_chat_sessions(sessions: Dict, auto_upload: bool = True):
-    """Save chat sessions to file and optionally upload to Drive"""
+def generate_session_id() -> str:
+    """Generate a unique random session ID"""
+    return secrets.token_hex(6)
+
+def write_chat_sessions(sessions: Dict, drive_manager: Optional[GoogleDriveManager] = None,
+                        archived_ids: frozenset = frozenset()) -> Optional[str]:
+    """Write chat sessions to disk and optionally upload to Drive; returns an error message on failure"""
+    # Runs on the save worker, which has no script context, so nothing here may call st.*
     try:
+        # Sessions not held in memory are carried over from the file instead of being dropped
+        if archived_ids and os.path.exists(CHAT_HISTORY_FILE):
+            with open(CHAT_HISTORY_FILE, 'rb') as f:
+                stored = pickle.load(f)
+            sessions = {**{sid: stored[sid] for sid in archived_ids if sid in stored}, **sessions}
+        
         # Save locally
         with open(CHAT_HISTORY_FILE, 'wb') as f:
             pickle.dump(sessions, f)
         
         # Save as JSON for Drive compatibility
-        with open(CHAT_HISTORY_JSON, 'w') as f:
-            json.dump(sessions, f, indent=2, default=str)
+        with open(CHAT_HISTORY_JSON, 'wb') as f:
+            f.write(dumps_json(sessions))
         
-        # Auto-upload to Drive if enabled and authenticated
-        if auto_upload and st.session_state.get('drive_enabled', False):
-            drive_manager = get_drive_manager()
-            if drive_manager.initialize_from_session():
-                drive_manager.upload_sessions(sessions, "chat_sessions_latest.json")
-                
+        if drive_manager and not drive_manager.upload_sessions(sessions, "chat_sessions_latest.json", report_errors=False):
+            return "Google Drive upload failed"
     except Exception as e:
-        st.error(f"Error saving chat sessions: {e}")
+        return str(e)
+    return None
+
+def report_pending_saves():
+    """Show the results of finished background saves on the script thread"""
+    pending_saves = st.session_state.get("pending_saves", [])
+    for save in [save for save in pending_saves if save.done()]:
+        pending_saves.remove(save)
+        error = save.result()
+        if error:
+            st.error(f"Error saving chat sessions: {error}")
+
+def save_chat_sessions(sessions: Dict, auto_upload: bool = True):
+    """Save chat sessions in the background and optionally upload to Drive"""
+    report_pending_saves()
+    
+    # Drive credentials live in session state, so resolve them here rather than in the worker
+    drive_manager = None
+    if auto_upload and st.session_state.get('drive_enabled', False):
+        manager = get_drive_manager()
+        if manager.initialize_from_session():
+            drive_manager = manager
+    
+    # Snapshot the dict so later edits in this rerun don't race the writer
+    archived_ids = st.session_state.setdefault("archived_session_ids", set())
+    st.session_state.setdefault("pending_saves", []).append(get_save_executor().submit(
+        write_chat_sessions, dict(sessions), drive_manager, frozenset(archived_ids)
+    ))
+    
+    # The save above still writes every session; only memory drops the oldest beyond the cap
+    if sessions is st.session_state.chat_sessions:
+        st.session_state.chat_sessions, evicted = split_chat_sessions(sessions)
+        archived_ids |= evicted
+
+def split_chat_sessions(sessions: Dict, limit: int = MAX_CHAT_HISTORY):
+    """Split into the newest sessions kept in memory and the ids of older ones left on disk"""
+    if len(sessions) <= limit:
+        return sessions, set()
+    newest = dict(heapq.nlargest(limit, sessions.items(), key=lambda x: x[1].get("last_activity", "")))
+    return newest, sessions.keys() - newest.keys()
 
 def load_chat_sessions() -> Dict:
     """Load chat sessions from file"""
@@ -310,6 +417,8 @@ def load_chat_sessions() -> Dict:
         st.error(f"Error loading chat sessions: {e}")
     return {}
 
+# Pure and called with the same stored timestamps on every rerun (sidebar, older messages)
+@lru_cache(maxsize=2048)
 def format_timestamp(timestamp: str) -> str:
     """Format timestamp for display"""
     try:
@@ -317,7 +426,7 @@ def format_timestamp(timestamp: str) -> str:
             dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
         else:
             dt = timestamp
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return dt.strftime(TIMESTAMP_FORMAT)
     except:
         return str(timestamp)
 
@@ -352,10 +461,11 @@ def initialize_session_state():
         st.session_state.messages = []
     
     if "current_session_id" not in st.session_state:
-        st.session_state.current_session_id = generate_session_id(st.session_state.user_info)
+        st.session_state.current_session_id = generate_session_id()
     
     if "chat_sessions" not in st.session_state:
-        st.session_state.chat_sessions = load_chat_sessions()
+        # Only the newest MAX_CHAT_HISTORY sessions are held per tab; older ones stay on disk
+        st.session_state.chat_sessions, st.session_state.archived_session_ids = split_chat_sessions(load_chat_sessions())
     
     if "selected_session" not in st.session_state:
         st.session_state.selected_session = None
@@ -384,13 +494,15 @@ def save_current_session():
     if not st.session_state.messages:
         return
     
+    now = datetime.now()
+    now_iso = now.isoformat()
     session_data = {
         "messages": st.session_state.messages.copy(),
         "user_info": st.session_state.user_info.copy(),
-        "created_at": st.session_state.get("session_created_at", datetime.now().isoformat()),
-        "last_activity": datetime.now().isoformat(),
+        "created_at": st.session_state.get("session_created_at", now_iso),
+        "last_activity": now_iso,
         "message_count": len(st.session_state.messages),
-        "session_name": f"Chat with {st.session_state.user_info['name']} - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        "session_name": f"Chat with {st.session_state.user_info['name']} - {now.strftime('%Y-%m-%d %H:%M')}"
     }
     
     st.session_state.chat_sessions[st.session_state.current_session_id] = session_data
@@ -412,7 +524,7 @@ def create_new_session():
         save_current_session()
     
     st.session_state.messages = []
-    st.session_state.current_session_id = generate_session_id(st.session_state.user_info) + f"_{int(time.time())}"
+    st.session_state.current_session_id = generate_session_id()
     st.session_state.session_created_at = datetime.now().isoformat()
     st.session_state.selected_session = None
     st.rerun()
@@ -429,54 +541,87 @@ def delete_session(session_id: str):
 # ----------------------------
 # AI Communication
 # ----------------------------
-def send_message_to_ai(prompt: str, webhook_url: str) -> str:
-    """Send message to AI and return response"""
-    try:
-        with st.spinner("🤖 Lil J is thinking..."):
-            recent_context = []
-            if len(st.session_state.messages) > 0:
-                recent_messages = st.session_state.messages[-5:]
-                for msg in recent_messages:
-                    recent_context.append({
-                        "role": msg["role"],
-                        "content": msg["content"][:200]
-                    })
-            
-            payload = {
-                "message": prompt,
-                "user_id": st.session_state.username,
-                "user_name": st.session_state.user_info['name'],
-                "user_role": st.session_state.user_info['role'],
-                "user_team": st.session_state.user_info['team'],
-                "timestamp": datetime.now().isoformat(),
-                "customer_count": len(st.session_state.customers_df),
-                "system": "laundry_crm",
-                "session_id": st.session_state.current_session_id,
-                "message_count": len(st.session_state.messages),
-                "context": recent_context
-            }
-            
-            response = requests.post(
-                webhook_url,
-                json=payload,
-                timeout=45,
-                headers={'Content-Type': 'application/json'}
-            )
-
-            if response.status_code == 200:
-                bot_response = extract_plain_text(response.text)
-                if not bot_response or bot_response.strip() == "":
-                    bot_response = "🤔 I received your message but couldn't generate a proper response. Could you try rephrasing?"
-                return bot_response
-            else:
-                return f"❌ AI service returned status {response.status_code}. Please try again later."
+def build_ai_payload(prompt: str) -> Dict:
+    """Build the webhook payload for a user prompt"""
+    recent_context = []
+    if len(st.session_state.messages) > 0:
+        recent_messages = st.session_state.messages[-5:]
+        for msg in recent_messages:
+            recent_context.append({
+                "role": msg["role"],
+                "content": msg["content"][:200]
+            })
+    
+    return {
+        "message": prompt,
+        "user_id": st.session_state.username,
+        "user_name": st.session_state.user_info['name'],
+        "user_role": st.session_state.user_info['role'],
+        "user_team": st.session_state.user_info['team'],
+        "timestamp": datetime.now().isoformat(),
+        "customer_count": len(st.session_state.customers_df),
+        "system": "laundry_crm",
+        "session_id": st.session_state.current_session_id,
+        "message_count": len(st.session_state.messages),
+        "context": recent_context
+    }
 
+def stream_ai_response(prompt: str, webhook_url: str):
+    """Send message to AI and yield the response as it arrives"""
+    # One POST per turn on the pooled session: the reply streams back to a single
+    # user, so turns are not batched across sessions (the webhook has no batch route)
+    try:
+        payload = build_ai_payload(prompt)
+        
+        with get_http_session().post(
+            webhook_url,
+            data=orjson.dumps(payload, default=str),
+            timeout=WEBHOOK_TIMEOUT,
+            stream=True,
+            headers={'Content-Type': 'application/json', 'Accept': 'text/event-stream, application/json'}
+        ) as response:
+            if response.status_code != 200:
+                yield f"❌ AI service returned status {response.status_code}. Please try again later."
+                return
+            
+            # Without a charset, requests decodes text/event-stream as ISO-8859-1 and ndjson not at all
+            if "charset" not in response.headers.get('Content-Type', '').lower():
+                response.encoding = "utf-8"
+            
+            # The format is told from the lines, not the Content-Type: n8n streams one JSON object
+            # per line with text in "item" chunks. Anything else (including a whole JSON document)
+            # is buffered and parsed as one reply, keeping its line breaks.
+            streamed = False
+            buffered = []
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("data:"):
+                    line = line[5:].strip()
+                try:
+                    chunk = json.loads(line) if line else None
+                except json.JSONDecodeError:
+                    chunk = None
+                if isinstance(chunk, dict) and chunk.get("type") == "item":
+                    streamed = True
+                    text = strip_html_tags(str(chunk.get("content", "")))
+                    if text:
+                        yield text
+                elif isinstance(chunk, dict) and chunk.get("type") in STREAM_CONTROL_TYPES and "content" not in chunk:
+                    continue
+                elif not streamed:
+                    buffered.append(line)
+            
+            if not streamed:
+                bot_response = extract_plain_text("\n".join(buffered))
+                yield bot_response if bot_response.strip() else EMPTY_AI_RESPONSE
+    
+    except requests.exceptions.ConnectTimeout:
+        yield "🔌 The AI service is not responding right now. Please try again in a moment."
     except requests.exceptions.Timeout:
-        return "⏱️ Request timed out. The AI might be processing a complex query. Please try again."
+        yield "⏱️ Request timed out. The AI might be processing a complex query. Please try again."
     except requests.exceptions.ConnectionError:
-        return "🔌 Connection error. Please check your internet connection and try again."
+        yield "🔌 Connection error. Please check your internet connection and try again."
     except Exception as e:
-        return f"⚠️ Unexpected error: {str(e)}"
+        yield f"⚠️ Unexpected error: {str(e)}"
 
 # ----------------------------
 # Google Drive UI Components
@@ -579,9 +724,10 @@ def render_sidebar():
     st.sidebar.subheader("👤 User Settings")
     with st.sidebar.expander("Edit User Info", expanded=False):
         new_name = st.text_input("Name:", value=st.session_state.user_info['name'])
+        current_role = st.session_state.user_info['role']
         new_role = st.selectbox("Role:", 
-                               ["Visitor", "Customer", "Manager", "Technician", "Admin"],
-                               index=["Visitor", "Customer", "Manager", "Technician", "Admin"].index(st.session_state.user_info['role']) if st.session_state.user_info['role'] in ["Visitor", "Customer", "Manager", "Technician", "Admin"] else 0)
+                               USER_ROLES,
+                               index=USER_ROLES.index(current_role) if current_role in USER_ROLES else 0)
         new_team = st.text_input("Team:", value=st.session_state.user_info['team'])
         
         if st.button("Update User Info"):
@@ -612,13 +758,14 @@ def render_sidebar():
     if st.session_state.chat_sessions:
         st.sidebar.write("**Previous Sessions:**")
         
-        sorted_sessions = sorted(
+        # Only ten are shown, so select them instead of sorting every stored session
+        recent_sessions = heapq.nlargest(
+            RECENT_SESSIONS_SHOWN,
             st.session_state.chat_sessions.items(),
-            key=lambda x: x[1].get("last_activity", ""),
-            reverse=True
+            key=lambda x: x[1].get("last_activity", "")
         )
         
-        for session_id, session_data in sorted_sessions[:10]:
+        for session_id, session_data in recent_sessions:
             session_name = session_data.get("session_name", f"Session {session_id[:8]}")
             message_count = session_data.get("message_count", 0)
             last_activity = session_data.get("last_activity", "")
@@ -642,6 +789,43 @@ def render_sidebar():
     
     return webhook_url
 
+def render_message_body(content: str, css_class: str, target=st):
+    """Render message text in a styled bubble, skipping markdown for plain text"""
+    bubble = f'<div class="{css_class}">{content}</div>'
+    if MARKDOWN_CHARS.isdisjoint(content):
+        # Single-line text with no markup renders identically as raw HTML
+        target.html(bubble)
+    else:
+        target.markdown(bubble, unsafe_allow_html=True)
+
+def render_chat_message(message: Dict):
+    """Render a single chat message with its timestamp"""
+    with st.chat_message(message["role"]):
+        if message["role"] == "assistant":
+            # Display assistant message with better formatting
+            render_message_body(message["content"], "assistant-message")
+        else:
+            # Display user message
+            render_message_body(message["content"], "user-message")
+        
+        # Add timestamp if available; messages store it pre-formatted, older sessions may not
+        if "display_time" in message:
+            st.caption(f"⏰ {message['display_time']}")
+        elif "timestamp" in message:
+            st.caption(f"⏰ {format_timestamp(message['timestamp'])}")
+
+def render_streaming_reply(chunks) -> str:
+    """Show a streaming reply as plain text, then format it once it completes"""
+    placeholder = st.empty()
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        # Plain text while streaming: no markdown parse of the partial reply on each update
+        placeholder.text(''.join(parts))
+    bot_response = ''.join(parts)
+    render_message_body(bot_response, "assistant-message", placeholder)
+    return bot_response
+
 def render_chat_stats():
     """Render enhanced chat statistics with Drive status"""
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -677,6 +861,7 @@ def main():
     
     # Initialize session state
     initialize_session_state()
+    report_pending_saves()
     
     # Custom CSS for better styling
     st.markdown("""
@@ -737,61 +922,55 @@ def main():
     chat_container = st.container()
     
     with chat_container:
-        # Display chat messages
-        for i, message in enumerate(st.session_state.messages):
-            with st.chat_message(message["role"]):
-                if message["role"] == "assistant":
-                    # Display assistant message with better formatting
-                    st.markdown(f'<div class="assistant-message">{message["content"]}</div>', 
-                              unsafe_allow_html=True)
-                else:
-                    # Display user message
-                    st.markdown(f'<div class="user-message">{message["content"]}</div>', 
-                              unsafe_allow_html=True)
-                
-                # Add timestamp if available
-                if "timestamp" in message:
-                    st.caption(f"⏰ {format_timestamp(message['timestamp'])}")
+        # Display only the latest messages; older turns are rendered on request
+        messages = st.session_state.messages
+        hidden_count = max(len(messages) - VISIBLE_MESSAGE_COUNT, 0)
+        if hidden_count and st.toggle(f"Show {hidden_count} earlier messages", key="show_earlier_messages"):
+            for message in messages[:hidden_count]:
+                render_chat_message(message)
+        for message in messages[hidden_count:]:
+            render_chat_message(message)
     
     # Chat input
     if prompt := st.chat_input("Type your message here... 💬"):
         # Add user message with timestamp
+        sent_at = datetime.now()
         user_message = {
             "role": "user", 
             "content": prompt,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": sent_at.isoformat(),
+            "display_time": sent_at.strftime(TIMESTAMP_FORMAT)
         }
         st.session_state.messages.append(user_message)
         
         # Display user message immediately
         with st.chat_message("user"):
-            st.markdown(f'<div class="user-message">{prompt}</div>', unsafe_allow_html=True)
-            st.caption(f"⏰ {format_timestamp(user_message['timestamp'])}")
+            render_message_body(prompt, "user-message")
+            st.caption(f"⏰ {user_message['display_time']}")
         
         # Get AI response
         if webhook_url:
-            bot_response = send_message_to_ai(prompt, webhook_url)
-            
-            # Add assistant message with timestamp
-            assistant_message = {
-                "role": "assistant", 
-                "content": bot_response,
-                "timestamp": datetime.now().isoformat()
-            }
-            st.session_state.messages.append(assistant_message)
-            
-            # Display assistant response
+            # Render chunks as they arrive; timestamp is added once the reply is complete
             with st.chat_message("assistant"):
-                st.markdown(f'<div class="assistant-message">{bot_response}</div>', 
-                          unsafe_allow_html=True)
-                st.caption(f"⏰ {format_timestamp(assistant_message['timestamp'])}")
+                bot_response = render_streaming_reply(coalesce_stream(stream_ai_response(prompt, webhook_url)))
+                
+                # Add assistant message with timestamp
+                replied_at = datetime.now()
+                assistant_message = {
+                    "role": "assistant", 
+                    "content": bot_response,
+                    "timestamp": replied_at.isoformat(),
+                    "display_time": replied_at.strftime(TIMESTAMP_FORMAT)
+                }
+                st.caption(f"⏰ {assistant_message['display_time']}")
+            st.session_state.messages.append(assistant_message)
             
             # Auto-save if enabled
             if st.session_state.auto_save:
                 save_current_session()
             
             # Update last activity
-            st.session_state.last_activity = datetime.now().isoformat()
+            st.session_state.last_activity = assistant_message["timestamp"]
             
         else:
             st.error("⚙️ Webhook URL not set. Please enter it in the sidebar.")
@@ -817,18 +996,19 @@ def main():
         if st.session_state.chat_sessions:
             if st.button("📤 Export All Sessions"):
                 # Create downloadable JSON
+                exported_at = datetime.now()
                 export_data = {
-                    "export_timestamp": datetime.now().isoformat(),
+                    "export_timestamp": exported_at.isoformat(),
                     "total_sessions": len(st.session_state.chat_sessions),
                     "user_info": st.session_state.user_info,
                     "sessions": st.session_state.chat_sessions
                 }
                 
-                json_str = json.dumps(export_data, indent=2, default=str)
+                json_bytes = dumps_json(export_data)
                 st.download_button(
                     label="💾 Download JSON",
-                    data=json_str,
-                    file_name=f"lil_j_chat_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    data=json_bytes,
+                    file_name=f"lil_j_chat_export_{exported_at.strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
 
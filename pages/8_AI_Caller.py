@@ -1,17 +1,20 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime, timedelta
 import pandas as pd
-from typing import List, Dict, Optional, Any
-import time
+from typing import List, Dict, Optional, Any, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import base64
+import hashlib
 from io import BytesIO
 import os
+import re
 import sqlite3
 import uuid
-import plotly.express as px
-import plotly.graph_objects as go
 
 # Configure the page
 st.set_page_config(
@@ -182,6 +185,9 @@ def init_database():
         )
     ''')
     
+    # Index the low-cardinality status column used by filters and the status breakdown
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_customers_status ON customers (status)')
+    
     conn.commit()
     conn.close()
 
@@ -224,11 +230,40 @@ ORDER_STATUSES = [
     "Pending", "Processing", "Shipped", "Delivered", "Completed", "Cancelled", "Refunded", "On Hold"
 ]
 
+# Order status indicators shown in the CRM manager
+ORDER_STATUS_ICONS = {
+    'Completed': '🟢',
+    'Processing': '🟡',
+    'Pending': '🟠',
+    'Cancelled': '🔴'
+}
+
 # Customer status options
 CUSTOMER_STATUSES = [
     "Hot Lead", "Warm Lead", "Cold Lead", "Customer", "Inactive", "Churned"
 ]
 
+# Bulk dispatch: numbers per Vapi request and how many requests run at once
+VAPI_BATCH_SIZE = 100
+MAX_CONCURRENT_DISPATCH = 4
+
+# Live call monitor: poll interval (seconds), Vapi statuses that need no further polling,
+# and consecutive status-check failures after which a call is no longer polled
+CALL_MONITOR_INTERVAL = 3
+CALL_FINAL_STATUSES = frozenset({'ended'})
+CALL_MONITOR_MAX_FAILURES = 3
+
+# Keywords for the quick transcript sentiment check
+POSITIVE_WORDS = ('yes', 'great', 'good', 'excellent', 'interested', 'perfect')
+NEGATIVE_WORDS = ('no', 'not', 'bad', 'terrible', 'uninterested', 'busy')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Phone validation: strip separators, control chars and the invisible format marks that come
+# along when numbers are pasted from spreadsheets (zero-width spaces, direction marks, BOM),
+# then require "+" and 9-17 digits
+PHONE_SEPARATOR_PATTERN = re.compile(r"[\s\-().\x00-\x1f\x7f-\x9f\xad\u061c\u180e\u200b-\u200f\u202a-\u202e\u2060-\u2064\u2066-\u206f\ufeff]")
+VALID_PHONE_PATTERN = re.compile(r"\+\d{9,17}")
+
 # Demo customers data (25 customers)
 DEMO_CUSTOMERS = [
     {
@@ -311,6 +346,8 @@ def init_session_state():
         'viewing_transcript': None,
         'viewing_recording': None,
         'call_monitoring': {},
+        'call_monitor_errors': {},
+        'dispatched_bulk_calls': set(),
         'call_results': []
     }
     
@@ -352,9 +389,11 @@ def save_call_to_db(call_data):
     
     conn.commit()
     conn.close()
+    clear_db_cache()
 
+@st.cache_resource(ttl=60, show_spinner=False)
 def get_calls_from_db(limit=None):
-    """Retrieve calls from database."""
+    """Retrieve calls from database (shared cached list, treat as read-only)."""
     conn = sqlite3.connect('vapi_calls.db')
     cursor = conn.cursor()
     
@@ -373,8 +412,9 @@ def get_calls_from_db(limit=None):
     
     return [dict(zip(columns, call)) for call in calls]
 
+@st.cache_resource(ttl=300, show_spinner=False)
 def get_customers_from_db(search_term=None, status_filter=None, limit=None):
-    """Retrieve customers from database with optional filtering."""
+    """Retrieve customers from database with optional filtering (shared cached list, treat as read-only)."""
     conn = sqlite3.connect('vapi_calls.db')
     cursor = conn.cursor()
     
@@ -411,6 +451,48 @@ def get_customers_from_db(search_term=None, status_filter=None, limit=None):
     
     return [dict(zip(columns, customer)) for customer in customers]
 
+@st.cache_resource(ttl=300, show_spinner=False)
+def get_customer_status_counts() -> Dict[str, int]:
+    """Count customers per status (shared cached dict, treat as read-only)."""
+    conn = sqlite3.connect('vapi_calls.db')
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT COALESCE(status, ''), COUNT(*) FROM customers GROUP BY COALESCE(status, '') ORDER BY COUNT(*) DESC")
+    status_counts = dict(cursor.fetchall())
+    conn.close()
+    
+    return status_counts
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def get_customer_summary() -> Dict[str, float]:
+    """Aggregate CRM headline figures in a single SQL pass (shared cached dict, treat as read-only)."""
+    conn = sqlite3.connect('vapi_calls.db')
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT COUNT(*), TOTAL(status = 'Hot Lead'), TOTAL(total_value), AVG(COALESCE(lead_score, 0))
+        FROM customers
+    ''')
+    total, hot_leads, total_value, avg_score = cursor.fetchone()
+    conn.close()
+    
+    return {
+        'total': total,
+        'hot_leads': int(hot_leads),
+        'total_value': total_value,
+        'avg_score': avg_score or 0.0
+    }
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def filter_customers_for_calls(statuses: Tuple[str, ...], min_score: int) -> List[Dict]:
+    """Customers matching the bulk-call filters (shared cached list, treat as read-only)."""
+    filtered_customers = get_customers_from_db()
+    if statuses:
+        filtered_customers = [c for c in filtered_customers if safe_str(c.get('status')) in statuses]
+    if min_score > 0:
+        filtered_customers = [c for c in filtered_customers if safe_int(c.get('lead_score', 0)) >= min_score]
+    return filtered_customers
+
 def get_customer_orders(customer_id):
     """Get orders for a specific customer."""
     conn = sqlite3.connect('vapi_calls.db')
@@ -426,76 +508,129 @@ def get_customer_orders(customer_id):
     
     return [dict(zip(columns, order)) for order in orders]
 
+@st.cache_resource(ttl=60, show_spinner=False)
+def get_calls_by_id() -> Dict[str, Dict]:
+    """Index all calls by id for O(1) lookups (shared cached dict, treat as read-only)."""
+    return {safe_str(call.get('id')): call for call in get_calls_from_db()}
+
+def clear_db_cache():
+    """Invalidate cached call and customer reads after a write."""
+    get_calls_from_db.clear()
+    get_calls_by_id.clear()
+    get_customers_from_db.clear()
+    get_customer_status_counts.clear()
+    get_customer_summary.clear()
+    filter_customers_for_calls.clear()
+
 def load_demo_customers():
     """Load demo customers into the database."""
+    now = datetime.now().isoformat()
+    customer_rows = [(
+        safe_str(customer['id']),
+        safe_str(customer['name']),
+        safe_str(customer['email']),
+        safe_str(customer['phone']),
+        safe_str(customer['company']),
+        safe_str(customer['position']),
+        safe_int(customer['lead_score']),
+        safe_str(customer['status']),
+        safe_str(customer['last_contact']),
+        safe_str(customer['notes']),
+        safe_float(customer['total_value']),
+        ','.join([safe_str(tag) for tag in customer.get('tags', [])]),
+        now,
+        now
+    ) for customer in DEMO_CUSTOMERS]
+    order_rows = [(
+        safe_str(order['id']),
+        safe_str(customer['id']),
+        safe_str(order['date']),
+        safe_float(order['amount']),
+        safe_str(order['status']),
+        safe_str(order['product']),
+        now,
+        now
+    ) for customer in DEMO_CUSTOMERS for order in customer.get('orders', [])]
+    
     conn = sqlite3.connect('vapi_calls.db')
     cursor = conn.cursor()
     
-    for customer in DEMO_CUSTOMERS:
-        # Insert customer
-        cursor.execute('''
-            INSERT OR REPLACE INTO customers 
-            (id, name, email, phone, company, position, lead_score, status, 
-             last_contact, notes, total_value, tags, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            safe_str(customer['id']),
-            safe_str(customer['name']),
-            safe_str(customer['email']),
-            safe_str(customer['phone']),
-            safe_str(customer['company']),
-            safe_str(customer['position']),
-            safe_int(customer['lead_score']),
-            safe_str(customer['status']),
-            safe_str(customer['last_contact']),
-            safe_str(customer['notes']),
-            safe_float(customer['total_value']),
-            ','.join([safe_str(tag) for tag in customer.get('tags', [])]),
-            datetime.now().isoformat(),
-            datetime.now().isoformat()
-        ))
-        
-        # Insert orders
-        for order in customer.get('orders', []):
-            cursor.execute('''
-                INSERT OR REPLACE INTO orders 
-                (id, customer_id, order_date, amount, status, product, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                safe_str(order['id']),
-                safe_str(customer['id']),
-                safe_str(order['date']),
-                safe_float(order['amount']),
-                safe_str(order['status']),
-                safe_str(order['product']),
-                datetime.now().isoformat(),
-                datetime.now().isoformat()
-            ))
+    # Write all rows in one transaction
+    cursor.executemany('''
+        INSERT OR REPLACE INTO customers 
+        (id, name, email, phone, company, position, lead_score, status, 
+         last_contact, notes, total_value, tags, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', customer_rows)
+    cursor.executemany('''
+        INSERT OR REPLACE INTO orders 
+        (id, customer_id, order_date, amount, status, product, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', order_rows)
     
     conn.commit()
     conn.close()
+    clear_db_cache()
 
 def validate_phone_number(phone: str) -> bool:
     """Basic phone number validation."""
     try:
-        phone_str = safe_str(phone).strip()
-        phone_str = ''.join(char for char in phone_str if char.isprintable())
-        
-        clean_phone = phone_str.replace(" ", "").replace("-", "").replace("(", "").replace(")", "").replace(".", "")
-        
-        if clean_phone.startswith("+") and len(clean_phone) >= 10 and len(clean_phone) <= 18:
-            if clean_phone[1:].isdigit():
-                return True
-        return False
+        clean_phone = PHONE_SEPARATOR_PATTERN.sub("", safe_str(phone).strip())
+        return VALID_PHONE_PATTERN.fullmatch(clean_phone) is not None
     except Exception:
         return False
 
+def valid_phone_mask(phones: pd.Series) -> pd.Series:
+    """Vectorized validate_phone_number over a Series of phone values."""
+    clean_phones = phones.astype(str).str.strip().str.replace(PHONE_SEPARATOR_PATTERN, "", regex=True)
+    return clean_phones.str.fullmatch(VALID_PHONE_PATTERN).fillna(False).astype(bool)
+
+@lru_cache(maxsize=256)
+def analyze_transcript(transcript: str) -> Tuple[int, str, int]:
+    """Return (word count, sentiment, emails mentioned) for a transcript."""
+    transcript_text = transcript.lower()
+    word_count = len(transcript.split())
+    
+    positive_count = sum(transcript_text.count(word) for word in POSITIVE_WORDS)
+    negative_count = sum(transcript_text.count(word) for word in NEGATIVE_WORDS)
+    sentiment = "Positive" if positive_count > negative_count else "Negative" if negative_count > positive_count else "Neutral"
+    
+    email_count = sum(1 for _ in EMAIL_PATTERN.finditer(transcript))
+    return word_count, sentiment, email_count
+
+@st.cache_data(show_spinner=False)
+def status_pie_chart(status_items: Tuple[Tuple[str, int], ...], title: str):
+    """Build a status distribution pie, cached on its (status, count) pairs."""
+    # Imported here so pages without charts don't pay for loading plotly
+    import plotly.express as px
+    return px.pie(
+        values=[count for _, count in status_items],
+        names=[status for status, _ in status_items],
+        title=title
+    )
+
+@st.cache_data(show_spinner=False)
+def parse_uploaded_csv(data: bytes) -> pd.DataFrame:
+    """Parse uploaded CSV bytes, cached so reruns skip re-parsing the same file."""
+    return pd.read_csv(BytesIO(data))
+
+@st.cache_resource
+def get_vapi_session() -> requests.Session:
+    """Shared HTTP session so Vapi requests reuse pooled connections."""
+    session = requests.Session()
+    # Only connection failures are retried; a call POST that reached Vapi is never resent
+    retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
 def make_vapi_call(
     api_key: str,
     assistant_id: str,
     customers: List[Dict],
     schedule_plan: Optional[Dict] = None,
-    base_url: str = "https://api.vapi.ai"
+    base_url: str = "https://api.vapi.ai",
+    session: Optional[requests.Session] = None
 ) -> Dict:
     """Make a call to the Vapi API for outbound calling."""
     
@@ -539,7 +674,7 @@ def make_vapi_call(
         
         json_payload = json.dumps(payload, ensure_ascii=False)
         
-        response = requests.post(
+        response = (session or get_vapi_session()).post(
             url, 
             headers=headers, 
             data=json_payload.encode('utf-8'),
@@ -551,6 +686,62 @@ def make_vapi_call(
     except Exception as e:
         return {"success": False, "error": safe_str(e)}
 
+def bulk_call_key(assistant_id: str, number: str) -> str:
+    """Session key recording that a number was dispatched with an assistant."""
+    return hashlib.blake2b(f"{assistant_id}\n{number}".encode(), digest_size=16).hexdigest()
+
+def dispatch_bulk_calls(api_key: str, assistant_id: str, customers: List[Dict]) -> List[Tuple[List[Dict], Dict]]:
+    """Send bulk calls in batches, dispatching the batches concurrently."""
+    # Vapi's "customers" array is its batch route; drop repeat numbers so no one is dialled twice
+    unique_customers = {}
+    for customer in customers:
+        unique_customers.setdefault(safe_str(customer.get('number')), customer)
+    customers = list(unique_customers.values())
+    batches = [customers[i:i + VAPI_BATCH_SIZE] for i in range(0, len(customers), VAPI_BATCH_SIZE)]
+    session = get_vapi_session()
+    
+    def send(batch):
+        return make_vapi_call(api_key=api_key, assistant_id=assistant_id, customers=batch, session=session)
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_DISPATCH, len(batches))) as executor:
+        return list(zip(batches, executor.map(send, batches)))
+
+def get_call_status(api_key: str, call_id: str, base_url: str = "https://api.vapi.ai") -> Dict:
+    """Fetch the current state of a call from the Vapi API."""
+    try:
+        headers = {"Authorization": f"Bearer {safe_str(api_key).strip()}"}
+        response = get_vapi_session().get(f"{base_url}/call/{safe_str(call_id)}", headers=headers, timeout=10)
+        response.raise_for_status()
+        return {"success": True, "data": response.json()}
+    except Exception as e:
+        return {"success": False, "error": safe_str(e)}
+
+@st.fragment(run_every=CALL_MONITOR_INTERVAL)
+def render_call_monitor():
+    """Poll in-flight call statuses, rerunning only this fragment instead of the page."""
+    monitoring = st.session_state.call_monitoring
+    errors = st.session_state.call_monitor_errors
+    for call_id, status in monitoring.items():
+        failures, last_error = errors.get(call_id, (0, ""))
+        # Back off after a failure by polling only every 2**failures ticks
+        due = st.session_state.get('call_monitor_tick', 0) % (2 ** failures) == 0
+        if status not in CALL_FINAL_STATUSES and failures < CALL_MONITOR_MAX_FAILURES and due:
+            result = get_call_status(st.session_state.api_key, call_id)
+            if result["success"]:
+                status = safe_str(result["data"].get('status', status))
+                monitoring[call_id] = status
+                errors.pop(call_id, None)
+                failures = 0
+            else:
+                failures, last_error = failures + 1, result["error"]
+                errors[call_id] = (failures, last_error)
+        st.write(f"📡 `{call_id}`: **{status}**")
+        if failures >= CALL_MONITOR_MAX_FAILURES:
+            st.error(f"Stopped checking `{call_id}` after {failures} failed status checks: {last_error}")
+        elif failures:
+            st.warning(f"Status check failed ({failures}/{CALL_MONITOR_MAX_FAILURES}): {last_error}")
+    st.session_state.call_monitor_tick = st.session_state.get('call_monitor_tick', 0) + 1
+
 def test_api_connection(api_key: str) -> Dict:
     """Test the API connection by making a simple request."""
     try:
@@ -560,7 +751,7 @@ def test_api_connection(api_key: str) -> Dict:
             "Content-Type": "application/json; charset=utf-8"
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_vapi_session().get(url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             return {"success": True, "data": response.json()}
@@ -686,17 +877,23 @@ def render_dashboard():
                                key=f"dashboard_call_expander_robust_{i}_004"):
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.write(f"**Assistant:** {safe_str(call.get('assistant_name', 'Unknown'))}")
-                        st.write(f"**Customer:** {safe_format_phone(call.get('customer_phone'))}")
+                        details = [
+                            f"**Assistant:** {safe_str(call.get('assistant_name', 'Unknown'))}",
+                            f"**Customer:** {safe_format_phone(call.get('customer_phone'))}"
+                        ]
                         customer_name = safe_str(call.get('customer_name'))
                         if customer_name:
-                            st.write(f"**Name:** {customer_name}")
+                            details.append(f"**Name:** {customer_name}")
+                        st.markdown("\n\n".join(details))
                     with col2:
-                        st.write(f"**Status:** {safe_str(call.get('status', 'Unknown'))}")
-                        st.write(f"**Date:** {safe_format_date(call.get('timestamp'))}")
+                        details = [
+                            f"**Status:** {safe_str(call.get('status', 'Unknown'))}",
+                            f"**Date:** {safe_format_date(call.get('timestamp'))}"
+                        ]
                         duration = safe_int(call.get('duration'))
                         if duration:
-                            st.write(f"**Duration:** {duration}s")
+                            details.append(f"**Duration:** {duration}s")
+                        st.markdown("\n\n".join(details))
         else:
             st.info("No calls made yet. Start by making your first call!")
         
@@ -822,11 +1019,20 @@ def render_make_calls():
                             }
                             
                             save_call_to_db(call_record)
+                            st.session_state.call_monitoring[call_id] = 'initiated'
                             st.json(call_data)
                         else:
                             st.json(call_data)
                     else:
                         st.error(f"Call failed: {safe_str(result['error'])}")
+            
+            if st.session_state.call_monitoring:
+                st.subheader("📡 Live Call Status")
+                render_call_monitor()
+                if st.button("🧹 Clear Monitored Calls", key="make_calls_clear_monitor_btn"):
+                    st.session_state.call_monitoring = {}
+                    st.session_state.call_monitor_errors = {}
+                    st.rerun()
         
         # Bulk Calls
         else:
@@ -850,11 +1056,8 @@ def render_make_calls():
                 )
                 
                 if bulk_numbers_text:
-                    lines = bulk_numbers_text.strip().split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line and validate_phone_number(line):
-                            customer_numbers.append(line)
+                    lines = pd.Series(bulk_numbers_text.strip().split('\n')).str.strip()
+                    customer_numbers = lines[valid_phone_mask(lines)].tolist()
                     st.info(f"Found {len(customer_numbers)} valid phone numbers")
             
             elif bulk_input_method == "Upload CSV":
@@ -862,9 +1065,9 @@ def render_make_calls():
                 
                 if uploaded_file:
                     try:
-                        df = pd.read_csv(uploaded_file)
+                        df = parse_uploaded_csv(uploaded_file.getvalue())
                         st.write("Preview:")
-                        st.dataframe(df.head())
+                        st.dataframe(df, height=250, use_container_width=True)
                         
                         phone_column = None
                         for col in ['phone', 'number', 'phone_number', 'Phone', 'Number']:
@@ -873,10 +1076,8 @@ def render_make_calls():
                                 break
                         
                         if phone_column:
-                            for phone in df[phone_column].dropna():
-                                phone_str = safe_str(phone).strip()
-                                if validate_phone_number(phone_str):
-                                    customer_numbers.append(phone_str)
+                            phones = df[phone_column].dropna().astype(str).str.strip()
+                            customer_numbers = phones[valid_phone_mask(phones)].tolist()
                             
                             st.info(f"Found {len(customer_numbers)} valid phone numbers")
                         else:
@@ -888,6 +1089,10 @@ def render_make_calls():
             elif bulk_input_method == "Select from CRM":
                 customers = get_customers_from_db()
                 
+                if st.button("🔄 Refresh", key="make_calls_crm_refresh_btn"):
+                    clear_db_cache()
+                    st.rerun()
+                
                 if customers:
                     st.write("Select customers to call:")
                     
@@ -899,11 +1104,7 @@ def render_make_calls():
                         min_score = st.slider("Minimum Lead Score", 0, 100, 0, key="make_calls_crm_score_slider_robust_020")
                     
                     # Filter customers
-                    filtered_customers = customers
-                    if status_filter:
-                        filtered_customers = [c for c in filtered_customers if safe_str(c.get('status')) in status_filter]
-                    if min_score > 0:
-                        filtered_customers = [c for c in filtered_customers if safe_int(c.get('lead_score', 0)) >= min_score]
+                    filtered_customers = filter_customers_for_calls(tuple(status_filter), min_score)
                     
                     # Customer selection
                     selected_customers = []
@@ -919,37 +1120,53 @@ def render_make_calls():
             
             # Bulk call execution
             if customer_numbers and st.button("📞 Make Bulk Calls", type="primary", key="make_calls_bulk_submit_btn_robust_022"):
-                customers = [{"number": num} for num in customer_numbers]
-                
-                with st.spinner(f"Making {len(customers)} calls..."):
-                    result = make_vapi_call(
-                        api_key=st.session_state.api_key,
-                        assistant_id=assistant_id,
-                        customers=customers
-                    )
-                
-                if result["success"]:
-                    st.success(f"Bulk calls initiated for {len(customers)} numbers!")
-                    call_data = result["data"]
+                # Numbers already sent with this assistant this session are skipped, so pressing
+                # the button again only retries the ones that failed
+                dispatched = st.session_state.dispatched_bulk_calls
+                pending_numbers = [num for num in customer_numbers if bulk_call_key(assistant_id, num) not in dispatched]
+                if not pending_numbers:
+                    st.warning("These numbers were already dispatched with this assistant. Change the list or assistant to call again.")
+                else:
+                    if len(pending_numbers) < len(customer_numbers):
+                        st.info(f"Skipping {len(customer_numbers) - len(pending_numbers)} numbers already dispatched with this assistant.")
+                    customers = [{"number": num} for num in pending_numbers]
                     
-                    # Save bulk call record
-                    call_record = {
-                        'id': str(uuid.uuid4()),
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'Bulk Calls',
-                        'assistant_name': assistant_name,
-                        'assistant_id': assistant_id,
-                        'customer_phone': f"{len(customers)} numbers",
-                        'call_id': safe_str(call_data) if isinstance(call_data, list) else safe_str(call_data.get('id', '')),
-                        'status': 'initiated',
-                        'notes': f"Bulk call to {len(customers)} customers"
-                    }
+                    with st.spinner(f"Making {len(customers)} calls..."):
+                        results = dispatch_bulk_calls(st.session_state.api_key, assistant_id, customers)
                     
-                    save_call_to_db(call_record)
-                    st.json(call_data)
-                else:
-                    st.error(f"Bulk calls failed: {safe_str(result['error'])}")
+                    sent = [(batch, result) for batch, result in results if result["success"]]
+                    failed = [(batch, result) for batch, result in results if not result["success"]]
+                    
+                    for batch, _ in sent:
+                        dispatched.update(bulk_call_key(assistant_id, c["number"]) for c in batch)
                     
+                    if sent:
+                        sent_count = sum(len(batch) for batch, _ in sent)
+                        st.success(f"Bulk calls initiated for {sent_count} numbers!")
+                        call_data = sent[0][1]["data"] if len(sent) == 1 else [result["data"] for _, result in sent]
+                        
+                        # Save bulk call record
+                        call_record = {
+                            'id': str(uuid.uuid4()),
+                            'timestamp': datetime.now().isoformat(),
+                            'type': 'Bulk Calls',
+                            'assistant_name': assistant_name,
+                            'assistant_id': assistant_id,
+                            'customer_phone': f"{sent_count} numbers",
+                            'call_id': safe_str(call_data) if isinstance(call_data, list) else safe_str(call_data.get('id', '')),
+                            'status': 'initiated',
+                            'notes': f"Bulk call to {sent_count} customers"
+                        }
+                        
+                        save_call_to_db(call_record)
+                        st.json(call_data)
+                    
+                    if failed:
+                        failed_numbers = [c["number"] for batch, _ in failed for c in batch]
+                        errors = "; ".join(dict.fromkeys(safe_str(result['error']) for _, result in failed))
+                        st.error(f"Bulk calls failed for {len(failed_numbers)} numbers: {errors}. Press the button again to retry them.")
+                        st.code("\n".join(failed_numbers), language=None)
+                        
     except Exception as e:
         st.error(f"Error in make calls page: {safe_str(e)}")
 
@@ -969,41 +1186,29 @@ def render_crm_dashboard():
         
         # CRM Overview metrics
         all_customers = get_customers_from_db()
+        summary = get_customer_summary()
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Customers", len(all_customers))
+            st.metric("Total Customers", summary['total'])
         
         with col2:
-            hot_leads = len([c for c in all_customers if safe_str(c.get('status')) == 'Hot Lead'])
-            st.metric("Hot Leads", hot_leads)
+            st.metric("Hot Leads", summary['hot_leads'])
         
         with col3:
-            total_value = sum([safe_float(c.get('total_value', 0)) for c in all_customers])
-            st.metric("Total Customer Value", safe_format_currency(total_value))
+            st.metric("Total Customer Value", safe_format_currency(summary['total_value']))
         
         with col4:
-            if all_customers:
-                avg_score = sum([safe_int(c.get('lead_score', 0)) for c in all_customers]) / len(all_customers)
-                st.metric("Avg Lead Score", f"{avg_score:.1f}")
-            else:
-                st.metric("Avg Lead Score", "0.0")
+            st.metric("Avg Lead Score", f"{summary['avg_score']:.1f}")
         
         # Customer status distribution
         if all_customers:
             st.subheader("📊 Customer Status Distribution")
-            status_counts = {}
-            for customer in all_customers:
-                status = safe_str(customer.get('status', 'Unknown'))
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = get_customer_status_counts()
             
             try:
-                fig = px.pie(
-                    values=list(status_counts.values()),
-                    names=list(status_counts.keys()),
-                    title="Customer Status Distribution"
-                )
+                fig = status_pie_chart(tuple(status_counts.items()), "Customer Status Distribution")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating chart: {safe_str(e)}")
@@ -1116,6 +1321,7 @@ def render_crm_dashboard():
                         
                         conn.commit()
                         conn.close()
+                        clear_db_cache()
                         
                         st.success(f"Customer {name} added successfully!")
                         st.session_state.show_add_customer = False
@@ -1152,11 +1358,11 @@ def render_crm_manager():
         # Sort customers
         try:
             if sort_by == "Name":
-                customers.sort(key=lambda x: safe_str(x.get('name', '')))
+                customers = sorted(customers, key=lambda x: safe_str(x.get('name', '')))
             elif sort_by == "Lead Score":
-                customers.sort(key=lambda x: safe_int(x.get('lead_score', 0)), reverse=True)
+                customers = sorted(customers, key=lambda x: safe_int(x.get('lead_score', 0)), reverse=True)
             elif sort_by == "Total Value":
-                customers.sort(key=lambda x: safe_float(x.get('total_value', 0)), reverse=True)
+                customers = sorted(customers, key=lambda x: safe_float(x.get('total_value', 0)), reverse=True)
         except Exception as e:
             st.warning(f"Error sorting customers: {safe_str(e)}")
         
@@ -1190,12 +1396,7 @@ def render_crm_manager():
                             
                             if orders:
                                 for j, order in enumerate(orders[:3]):  # Show last 3 orders
-                                    status_color = {
-                                        'Completed': '🟢',
-                                        'Processing': '🟡', 
-                                        'Pending': '🟠',
-                                        'Cancelled': '🔴'
-                                    }.get(safe_str(order.get('status', '')), '⚪')
+                                    status_color = ORDER_STATUS_ICONS.get(safe_str(order.get('status', '')), '⚪')
                                     
                                     order_id = safe_str(order.get('id', 'Unknown'))
                                     order_amount = safe_format_currency(order.get('amount'))
@@ -1307,22 +1508,28 @@ def render_call_history():
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            st.write(f"**Type:** {safe_str(call.get('type', 'Unknown'))}")
-                            st.write(f"**Assistant:** {safe_str(call.get('assistant_name', 'Unknown'))}")
-                            st.write(f"**Customer:** {call_phone}")
+                            details = [
+                                f"**Type:** {safe_str(call.get('type', 'Unknown'))}",
+                                f"**Assistant:** {safe_str(call.get('assistant_name', 'Unknown'))}",
+                                f"**Customer:** {call_phone}"
+                            ]
                             customer_name = safe_str(call.get('customer_name', ''))
                             if customer_name:
-                                st.write(f"**Name:** {customer_name}")
+                                details.append(f"**Name:** {customer_name}")
+                            st.markdown("\n\n".join(details))
                         
                         with col2:
-                            st.write(f"**Status:** {safe_str(call.get('status', 'Unknown'))}")
-                            st.write(f"**Call ID:** {safe_str(call.get('call_id', 'Unknown'))}")
+                            details = [
+                                f"**Status:** {safe_str(call.get('status', 'Unknown'))}",
+                                f"**Call ID:** {safe_str(call.get('call_id', 'Unknown'))}"
+                            ]
                             duration = safe_int(call.get('duration'))
                             if duration:
-                                st.write(f"**Duration:** {duration}s")
+                                details.append(f"**Duration:** {duration}s")
                             cost = safe_float(call.get('cost'))
                             if cost:
-                                st.write(f"**Cost:** ${cost:.4f}")
+                                details.append(f"**Cost:** ${cost:.4f}")
+                            st.markdown("\n\n".join(details))
                         
                         with col3:
                             transcript = safe_str(call.get('transcript', ''))
@@ -1361,8 +1568,7 @@ def render_transcripts():
         
         if viewing_transcript_id:
             # Display specific transcript
-            calls = get_calls_from_db()
-            call = next((c for c in calls if safe_str(c.get('id')) == safe_str(viewing_transcript_id)), None)
+            call = get_calls_by_id().get(safe_str(viewing_transcript_id))
             
             if call and call.get('transcript'):
                 st.subheader(f"📝 Transcript: {safe_format_phone(call.get('customer_phone'))}")
@@ -1414,8 +1620,7 @@ Transcript:
                 st.subheader("🔍 Quick Analysis")
                 
                 try:
-                    transcript_text = transcript_content.lower()
-                    word_count = len(transcript_content.split())
+                    word_count, sentiment, email_count = analyze_transcript(transcript_content)
                     
                     col1, col2, col3 = st.columns(3)
                     
@@ -1423,21 +1628,10 @@ Transcript:
                         st.metric("Word Count", word_count)
                     
                     with col2:
-                        # Simple sentiment analysis
-                        positive_words = ['yes', 'great', 'good', 'excellent', 'interested', 'perfect']
-                        negative_words = ['no', 'not', 'bad', 'terrible', 'uninterested', 'busy']
-                        
-                        positive_count = sum(transcript_text.count(word) for word in positive_words)
-                        negative_count = sum(transcript_text.count(word) for word in negative_words)
-                        
-                        sentiment = "Positive" if positive_count > negative_count else "Negative" if negative_count > positive_count else "Neutral"
                         st.metric("Sentiment", sentiment)
                     
                     with col3:
-                        # Extract phone numbers or emails mentioned
-                        import re
-                        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', transcript_content)
-                        st.metric("Emails Mentioned", len(emails))
+                        st.metric("Emails Mentioned", email_count)
                 except Exception as e:
                     st.error(f"Error analyzing transcript: {safe_str(e)}")
             
@@ -1554,8 +1748,7 @@ def render_recordings():
         
         if viewing_recording_id:
             # Display specific recording
-            calls = get_calls_from_db()
-            call = next((c for c in calls if safe_str(c.get('id')) == safe_str(viewing_recording_id)), None)
+            call = get_calls_by_id().get(safe_str(viewing_recording_id))
             
             if call:
                 st.subheader(f"🎵 Recording: {safe_format_phone(call.get('customer_phone'))}")
@@ -1736,31 +1929,28 @@ def render_analytics():
             st.subheader("🤖 Assistant Performance")
             
             try:
-                assistant_stats = {}
-                for call in calls:
-                    assistant = safe_str(call.get('assistant_name', 'Unknown'))
-                    if assistant not in assistant_stats:
-                        assistant_stats[assistant] = {'total': 0, 'completed': 0, 'duration': 0}
-                    
-                    assistant_stats[assistant]['total'] += 1
-                    if safe_str(call.get('status')) == 'completed':
-                        assistant_stats[assistant]['completed'] += 1
-                    assistant_stats[assistant]['duration'] += safe_int(call.get('duration', 0))
+                calls_df = pd.DataFrame(calls, columns=['assistant_name', 'status', 'duration'])
                 
-                # Create assistant performance dataframe
-                assistant_data = []
-                for assistant, stats in assistant_stats.items():
-                    success_rate = (stats['completed'] / stats['total'] * 100) if stats['total'] > 0 else 0
-                    avg_duration = stats['duration'] / stats['total'] if stats['total'] > 0 else 0
-                    
-                    assistant_data.append({
-                        'Assistant': assistant,
-                        'Total Calls': stats['total'],
-                        'Success Rate': f"{success_rate:.1f}%",
-                        'Avg Duration': f"{avg_duration:.1f}s"
-                    })
+                # Typed columns so the per-assistant aggregation stays vectorized
+                assistant_stats = pd.DataFrame({
+                    'Assistant': calls_df['assistant_name'].fillna('').astype(str),
+                    'completed': calls_df['status'].eq('completed'),
+                    'duration': pd.to_numeric(calls_df['duration'], errors='coerce').fillna(0)
+                }).groupby('Assistant', sort=False).agg(
+                    total=('completed', 'size'),
+                    completed=('completed', 'sum'),
+                    duration=('duration', 'sum')
+                )
                 
-                df_assistants = pd.DataFrame(assistant_data)
+                # Create assistant performance dataframe
+                success_rate = assistant_stats['completed'] / assistant_stats['total'] * 100
+                avg_duration = assistant_stats['duration'] / assistant_stats['total']
+                df_assistants = pd.DataFrame({
+                    'Assistant': assistant_stats.index,
+                    'Total Calls': assistant_stats['total'].to_numpy(),
+                    'Success Rate': success_rate.map('{:.1f}%'.format).to_numpy(),
+                    'Avg Duration': avg_duration.map('{:.1f}s'.format).to_numpy()
+                })
                 st.dataframe(df_assistants, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating assistant performance table: {safe_str(e)}")
@@ -1771,14 +1961,10 @@ def render_analytics():
             
             try:
                 # Customer status distribution
-                status_counts = {}
-                for customer in customers:
-                    status = safe_str(customer.get('status', 'Unknown'))
-                    status_counts[status] = status_counts.get(status, 0) + 1
+                status_counts = get_customer_status_counts()
                 
                 if status_counts:
-                    fig = px.pie(values=list(status_counts.values()), names=list(status_counts.keys()), 
-                                title="Customer Status Distribution")
+                    fig = status_pie_chart(tuple(status_counts.items()), "Customer Status Distribution")
                     st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating customer status chart: {safe_str(e)}")
@@ -1890,6 +2076,7 @@ def render_settings():
                             cursor.execute('DELETE FROM customer_interactions')
                             conn.commit()
                             conn.close()
+                            clear_db_cache()
                             st.success("All data cleared!")
                         except Exception as e:
                             st.error(f"Error clearing data: {safe_str(e)}")
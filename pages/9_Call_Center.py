@@ -1,15 +1,26 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from gspread_dataframe import get_as_dataframe
-from oauth2client.service_account import ServiceAccountCredentials
 import json
+import re
+import os
+import time
+import hashlib
+import threading
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 st.set_page_config(page_title="Call Analysis CRM - Universal Audio", layout="wide")
 st.title("📞 Call CRM Dashboard")
 st.caption("Live analytics from Google Sheets | Advanced filtering | Universal audio player for all major formats")
 
 GSHEET_URL = "https://docs.google.com/spreadsheets/d/1LFfNwb9lRQpIosSEvV3O6zIwymUIWeG9L_k7cxw1jQs/edit?gid=0"
+# Local Parquet snapshot of the sheet, reused until it is this many seconds old; past the
+# hard limit it is no longer served while a background refresh runs
+SNAPSHOT_MAX_AGE = 300
+SNAPSHOT_HARD_MAX_AGE = 3600
+# Snapshots hold customer data, so they live in a private temp dir and are purged after the hard limit
+SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), "call_center_snapshots")
 
 # --------------- COLUMN DEFINITIONS ---------------
 EXPECTED_COLUMNS = [
@@ -25,6 +36,27 @@ EXPECTED_COLUMNS = [
     "customer_lifetime_value", "call_category", "Upload_Timestamp"
 ]
 
+# Low-cardinality text columns stored as category; measurement columns parsed to numbers
+LOW_CARD_COLS = [
+    "voice_agent_name", "call_success", "intent_detected", "emotion_detected", "language_detected",
+    "customer_tier", "call_category", "call_outcome", "Booking Status", "next_best_action"
+]
+NUMERIC_INT_COLS = ["interruption_count"]
+NUMERIC_FLOAT_COLS = [
+    "call_duration_seconds", "sentiment_score", "confidence_score", "ai_accuracy_score",
+    "conversion_probability", "agent_performance_score", "speech_rate_wpm", "silence_percentage"
+]
+# Money stays float64: float32 keeps only about 7 significant digits
+MONEY_COLS = ["cost", "revenue_impact", "customer_lifetime_value"]
+# Sheet text kept under this prefix for numeric columns where parsing dropped non-numeric cells
+RAW_PREFIX = "_raw_"
+
+# Columns shown in the AI Summary table
+INSIGHT_COLUMNS = [
+    "call_id", "customer_name", "call_date", "voice_agent_name", "call_outcome", "call_success",
+    "summary", "action_items", "transcript"
+]
+
 SUPPORTED_AUDIO_EXTS = [
     "mp3", "wav", "ogg", "flac", "aac", "m4a", "webm", "oga",
 ]
@@ -42,9 +74,11 @@ with st.sidebar:
     )
     st.markdown(
         "*Required for live Google Sheets connection.*\n"
-        "<sup>Your JSON file is never stored on the server.</sup>",
+        "<sup>Your JSON file is never stored on the server. Sheet data is cached in a private "
+        "temporary file for up to an hour, or until you press Refresh Data.</sup>",
         unsafe_allow_html=True
     )
+    refresh_data = st.button("🔄 Refresh Data", help="Re-fetch the sheet instead of using the local snapshot")
     st.divider()
     st.header("🔍 Call Filters")
     customer_name = st.text_input("Customer Name")
@@ -54,58 +88,259 @@ with st.sidebar:
     st.info("Apply multiple filters together for precision search.\nAudio tab supports MP3, WAV, OGG, FLAC, AAC, M4A, WEBM & more*")
 
 # --------- DATA LOADING ----------
-@st.cache_data(show_spinner=True)
-def load_data(uploaded_json):
-    if uploaded_json is None:
+def prepare_calls_df(df):
+    """Pad/reorder to EXPECTED_COLUMNS and add the numeric sentiment filter column."""
+    # One reindex pads and orders the columns into a single consolidated block
+    df = df.reindex(columns=EXPECTED_COLUMNS, fill_value="")
+    # Parsed once per load; blank or malformed scores count as neutral (0)
+    df["_sentiment_num"] = pd.to_numeric(df["sentiment_score"], errors="coerce").fillna(0.0)
+    # Fill blank h:mm:ss labels from the seconds column in one vectorized pass
+    secs = pd.to_numeric(df["call_duration_seconds"], errors="coerce")
+    missing = (df["call_duration_hms"].astype(str).str.strip() == "") & secs.notna()
+    if missing.any():
+        total = secs[missing].astype("int64")
+        h, m, sec = total // 3600, total % 3600 // 60, total % 60
+        mmss = m.astype(str).str.zfill(2) + ":" + sec.astype(str).str.zfill(2)
+        df.loc[missing, "call_duration_hms"] = mmss.where(h == 0, h.astype(str) + ":" + mmss)
+    # Downcast once per load so filters and value_counts work on compact dtypes
+    df[LOW_CARD_COLS] = df[LOW_CARD_COLS].astype(str).astype("category")
+    for col in NUMERIC_INT_COLS:
+        set_numeric(df, col, pd.to_numeric(df[col], errors="coerce", downcast="integer"))
+    for col in NUMERIC_FLOAT_COLS:
+        set_numeric(df, col, pd.to_numeric(df[col], errors="coerce", downcast="float"))
+    for col in MONEY_COLS:
+        # "$1,200.50" parses as 1200.5; the sheet text is still kept for export as typed
+        amounts = df[col].astype(str).str.replace(r"[$,\s]", "", regex=True)
+        set_numeric(df, col, pd.to_numeric(amounts, errors="coerce"), pd.to_numeric(df[col], errors="coerce"))
+    return df
+
+def set_numeric(df, col, parsed, plain=None):
+    """Store the parsed column, keeping the sheet text if any non-blank cell is not a plain number."""
+    plain = parsed if plain is None else plain
+    if (plain.isna() & (df[col].astype(str).str.strip() != "")).any():
+        df[RAW_PREFIX + col] = df[col]
+    df[col] = parsed
+
+def export_frame(df):
+    """Sheet columns for CSV export, with the original text for columns that lost cells to parsing."""
+    raw_cols = [col for col in EXPECTED_COLUMNS if RAW_PREFIX + col in df.columns]
+    if not raw_cols:
+        return df[EXPECTED_COLUMNS]
+    out = df[EXPECTED_COLUMNS].copy()
+    for col in raw_cols:
+        out[col] = df[RAW_PREFIX + col]
+    return out
+
+def snapshot_path(creds_hash):
+    """Snapshot file for these credentials, so one account never reads another's data."""
+    os.makedirs(SNAPSHOT_DIR, mode=0o700, exist_ok=True)
+    return os.path.join(SNAPSHOT_DIR, f"call_center_snapshot_{creds_hash[:16]}.parquet")
+
+def purge_old_snapshots():
+    """Delete snapshots (and leftover temp files) past the hard age limit."""
+    cutoff = time.time() - SNAPSHOT_HARD_MAX_AGE
+    for entry in os.scandir(SNAPSHOT_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # Removed by another session or swapped out by a refresh
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client(creds_hash, _creds_info):
+    """Authorized gspread client, reused across reruns for the same credentials."""
+    # Google client libraries load only when a live fetch is needed, not for snapshot or placeholder views
+    import gspread
+    from google.oauth2.service_account import Credentials
+    scope = [
+        "https://spreadsheets.google.com/feeds",
+        "https://www.googleapis.com/auth/drive"
+    ]
+    creds = Credentials.from_service_account_info(_creds_info, scopes=scope)
+    return gspread.authorize(creds)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def sheet_column_ranges(creds_hash, _creds_info):
+    """(name, A1 column range) for each expected column, located via the sheet's header row."""
+    from gspread.utils import rowcol_to_a1
+    sheet = get_gspread_client(creds_hash, _creds_info).open_by_url(GSHEET_URL).sheet1
+    ranges = {}
+    for i, name in enumerate(sheet.row_values(1)):
+        name = name.strip()
+        if name in EXPECTED_COLUMNS and name not in ranges:
+            letter = rowcol_to_a1(1, i + 1)[:-1]
+            ranges[name] = f"{letter}:{letter}"
+    return list(ranges.items())
+
+def fetch_sheet_columns(sheet, creds_hash, creds_info):
+    """Download only the expected columns in one batch_get; falls back to the full grid if the header moved."""
+    ranges = sheet_column_ranges(creds_hash, creds_info)
+    columns = sheet.batch_get([a1 for _, a1 in ranges]) if ranges else []
+    # Each column comes back as [[header], [value], [], ...], trimmed after its last non-empty cell
+    data = {
+        name: [cell[0] if cell else "" for cell in column[1:]]
+        for (name, _), column in zip(ranges, columns)
+        if column and column[0] and column[0][0].strip() == name
+    }
+    # No matching header at all (or a moved one): fall back to the full grid
+    if not ranges or len(data) != len(ranges):
+        sheet_column_ranges.clear()
+        values = sheet.get_all_values()
+        df = pd.DataFrame(values[1:], columns=[col.strip() for col in values[0]]) if values else pd.DataFrame()
+        # Blank header cells repeat; keep the first of each name so the frame can be reindexed
+        return df.loc[:, ~df.columns.duplicated()]
+    length = max((len(values) for values in data.values()), default=0)
+    return pd.DataFrame({name: values + [""] * (length - len(values)) for name, values in data.items()})
+
+@st.cache_resource
+def get_refresh_executor():
+    """Single background worker that rebuilds stale snapshots off the script thread."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="call-center-refresh")
+
+@st.cache_resource
+def get_refresh_jobs():
+    """Latest background refresh future per credentials hash, checked on each run."""
+    return {}
+
+def refresh_snapshot(creds_hash, creds_info):
+    """Fetch the sheet, prepare the frame and write it to the Parquet snapshot."""
+    sheet = get_gspread_client(creds_hash, creds_info).open_by_url(GSHEET_URL).sheet1
+    df = fetch_sheet_columns(sheet, creds_hash, creds_info)
+    # Fully blank rows dropped with one vectorized mask
+    df = df[(df != "").any(axis=1)]
+    df = prepare_calls_df(df)
+    # Write a temp file and swap it in, so concurrent readers never see a half-written snapshot
+    path = snapshot_path(creds_hash)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except Exception:
+        # The snapshot is only a cache; a failed write just means the next load hits Sheets
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+@st.cache_data(ttl=300, show_spinner=True)
+def load_data(creds_hash, _creds_info):
+    if creds_hash is None:
         st.info("Please upload your Google Service Account JSON file in the sidebar to enable live data.")
-        return pd.DataFrame(columns=EXPECTED_COLUMNS)
+        return prepare_calls_df(pd.DataFrame(columns=EXPECTED_COLUMNS))
     try:
-        json_dict = json.load(uploaded_json)
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(json_dict, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(GSHEET_URL).sheet1
-        df = get_as_dataframe(sheet, evaluate_formulas=True).dropna(how="all")
-        df.columns = [col.strip() for col in df.columns]
-        return df
+        path = snapshot_path(creds_hash)
+        purge_old_snapshots()
+        age = time.time() - os.path.getmtime(path) if os.path.exists(path) else None
+        if age is None or age >= SNAPSHOT_HARD_MAX_AGE:
+            return refresh_snapshot(creds_hash, _creds_info)
+        if age >= SNAPSHOT_MAX_AGE:
+            # Stale: serve it now and rebuild it in the background instead of blocking the page
+            jobs = get_refresh_jobs()
+            job = jobs.get(creds_hash)
+            if job is None or job.done():
+                jobs[creds_hash] = get_refresh_executor().submit(refresh_snapshot, creds_hash, _creds_info)
+        return pd.read_parquet(path)
     except Exception as e:
         st.warning(f"⚠️ Could not load live data. Using placeholder columns. Error: {e}")
-        return pd.DataFrame(columns=EXPECTED_COLUMNS)
+        return prepare_calls_df(pd.DataFrame(columns=EXPECTED_COLUMNS))
 
-df = load_data(uploaded_json)
+# -------- FILTER LOGIC ----------
+@lru_cache(maxsize=64)
+def search_pattern(query):
+    """Case-insensitive literal pattern for a search box, compiled once per query."""
+    return re.compile(re.escape(query), re.IGNORECASE)
 
-for col in EXPECTED_COLUMNS:
-    if col not in df.columns:
-        df[col] = ""
-df = df[EXPECTED_COLUMNS]
+def apply_filters(df, customer_name, agent_name, call_success, sentiment_range):
+    """Combine every active filter into one boolean mask and index the frame once."""
+    mask = df["_sentiment_num"].between(*sentiment_range).to_numpy()
+    if customer_name:
+        mask &= df["customer_name"].str.contains(search_pattern(customer_name), na=False).to_numpy()
+    if agent_name:
+        mask &= df["voice_agent_name"].str.contains(search_pattern(agent_name), na=False).to_numpy(dtype=bool)
+    if call_success:
+        mask &= (df["call_success"].astype(str).str.lower() == call_success.lower()).to_numpy()
+    # Nothing filtered out (the default view): hand back the loaded frame instead of a copy
+    return df if mask.all() else df[mask]
 
-# -------- FILTER LOGIC ----------
-filtered_df = df.copy()
-if customer_name:
-    filtered_df = filtered_df[filtered_df["customer_name"].str.contains(customer_name, case=False, na=False)]
-if agent_name:
-    filtered_df = filtered_df[filtered_df["voice_agent_name"].str.contains(agent_name, case=False, na=False)]
-if call_success:
-    filtered_df = filtered_df[filtered_df["call_success"].astype(str).str.lower() == call_success.lower()]
-filtered_df = filtered_df[
-    (filtered_df["sentiment_score"].astype(str).replace("None", "0").astype(float) >= sentiment_range[0]) &
-    (filtered_df["sentiment_score"].astype(str).replace("None", "0").astype(float) <= sentiment_range[1])
-]
+@st.cache_data(show_spinner=False)
+def export_csv(df):
+    """CSV bytes for the filtered frame shown in this run; an unchanged frame reuses the encoded file."""
+    return export_frame(df).to_csv(index=False).encode("utf-8")
+
+@st.cache_data(show_spinner=False)
+def call_analytics(df):
+    """Headline metrics and chart series for the analytics tab; keyed on the frame loaded in this run."""
+    return {
+        "total": len(df),
+        "customers": df["customer_name"].nunique(),
+        "agents": df["voice_agent_name"].nunique(),
+        "success_rate": 100 * df["call_success"].str.lower().eq("yes").mean() if len(df) else None,
+        "avg_duration": df["call_duration_seconds"].mean(),
+        "calls_by_agent": df["voice_agent_name"].value_counts(),
+        "calls_by_date": df.groupby("call_date")["call_id"].count(),
+    }
 
-# --------- ANALYTICS FUNCTIONS -------
-def readable_sec(seconds):
-    """Turn seconds into h:mm:ss."""
+# --------- LOAD & FILTER ----------
+# Parse the service account JSON once per uploaded file; reruns reuse the dict and its hash
+if uploaded_json is None:
+    creds_hash, creds_info = None, None
+else:
+    if st.session_state.get("creds_file_id") != uploaded_json.file_id:
+        raw = uploaded_json.getvalue()
+        try:
+            st.session_state["creds_info"] = json.loads(raw)
+            st.session_state["creds_hash"] = hashlib.sha256(raw).hexdigest()
+        except ValueError as e:
+            st.session_state["creds_info"] = st.session_state["creds_hash"] = None
+            st.warning(f"⚠️ Could not read the service account JSON. Error: {e}")
+        st.session_state["creds_file_id"] = uploaded_json.file_id
+    creds_hash, creds_info = st.session_state["creds_hash"], st.session_state["creds_info"]
+
+if refresh_data and creds_hash:
+    for cached in (load_data, sheet_column_ranges):
+        cached.clear()
+    get_refresh_jobs().pop(creds_hash, None)
     try:
-        seconds = int(float(seconds))
-        h = seconds // 3600
-        m = (seconds % 3600) // 60
-        s = seconds % 60
-        return f"{h:d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
-    except Exception:
-        return str(seconds)
+        os.remove(snapshot_path(creds_hash))
+    except FileNotFoundError:
+        pass  # Never written, or a background refresh is swapping it in right now
+df = load_data(creds_hash, creds_info)
+
+# The background worker cannot call st.*; report its failure here, on the script thread
+refresh_job = get_refresh_jobs().get(creds_hash) if creds_hash else None
+if refresh_job is not None and refresh_job.done() and refresh_job.exception() is not None:
+    st.warning(f"⚠️ Background refresh failed; showing the last saved snapshot. Error: {refresh_job.exception()}")
+
+filtered_df = apply_filters(df, customer_name, agent_name, call_success, sentiment_range)
+
+# ------- RECORDING PLAYER ----------
+@st.fragment
+def recording_player(rec_df):
+    """Single player for the chosen recording; picking another call reruns only this fragment."""
+    labels = (rec_df["call_id"].astype(str) + " — " + rec_df["customer_name"].astype(str)).tolist()
+    choice = st.selectbox("Play recording", range(len(rec_df)), format_func=labels.__getitem__)
+    row = rec_df.iloc[choice]
+    url, filename = row["url"], row["filename"]
+    ext = row["ext"] if pd.notna(row["ext"]) else None
+    icon = AUDIO_FORMAT_ICONS.get(ext, "🎧")
+    st.markdown(f"**{icon} {row['call_id']} — {row['customer_name']}**")
+    st.write(f"**Audio file:** `{filename}` | **Format:** `{ext or 'Unknown'}`")
+
+    # Attempt st.audio play, fallback to clickable link
+    if ext in SUPPORTED_AUDIO_EXTS or ext is None:  # Try anyway; browsers may support more
+        try:
+            st.audio(url)
+        except Exception as e:
+            st.warning(f"Could not play audio in-app: {e}")
+            st.markdown(f"[Play/download manually]({url})")
+    else:
+        st.warning(f"Audio file appears to be an unsupported format: `{ext}`. [Manual link]({url})")
+
+    # Transcript preview if available
+    if row["transcript"]:
+        with st.expander("📝 Transcript Preview"):
+            st.text(row["transcript"][:1000] + ("..." if len(row["transcript"])>1000 else ""))
+    st.caption("Supported: mp3, wav, ogg, flac, aac, m4a, webm, oga & more by browser. "
+               "If playback fails, try manual download.")
 
 # ------- MAIN TABS ----------
 tab1, tab2, tab3, tab4 = st.tabs([
@@ -114,30 +349,40 @@ tab1, tab2, tab3, tab4 = st.tabs([
 
 with tab1:
     st.subheader("📋 Full Call Log Table")
-    st.dataframe(filtered_df, use_container_width=True)
+    st.dataframe(filtered_df, use_container_width=True, column_order=EXPECTED_COLUMNS)
     st.caption(f"Showing {len(filtered_df)} calls out of {len(df)} total records.")
+    # Encode only once an export is asked for, not on every filter change
+    if st.toggle("Prepare CSV export", key="call_log_export"):
+        st.download_button(
+            "📥 Download CSV",
+            data=export_csv(filtered_df),
+            file_name="call_log.csv",
+            mime="text/csv"
+        )
 
 with tab2:
     st.subheader("📊 Analytics & Insights")
+    stats = call_analytics(df)
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Total Calls", len(df))
+        st.metric("Total Calls", stats["total"])
     with col2:
-        st.metric("Unique Customers", df["customer_name"].nunique())
+        st.metric("Unique Customers", stats["customers"])
     with col3:
-        st.metric("Programs/Agents", df["voice_agent_name"].nunique())
+        st.metric("Programs/Agents", stats["agents"])
     with col4:
-        st.metric("Success Rate (%)", f"{100*df['call_success'].str.lower().eq('yes').mean():.1f}" if len(df) else "-")
+        st.metric("Success Rate (%)", f"{stats['success_rate']:.1f}" if stats["success_rate"] is not None else "-")
     with col5:
-        durs = pd.to_numeric(df["call_duration_seconds"], errors='coerce').dropna()
-        st.metric("Avg Duration (min)", f"{(durs.mean()/60):.2f}" if not durs.empty else "-")
+        # Already numeric from ingest; mean() skips the blank (NaN) durations
+        avg_duration = stats["avg_duration"]
+        st.metric("Avg Duration (min)", f"{(avg_duration/60):.2f}" if pd.notna(avg_duration) else "-")
 
     st.markdown("#### 📈 Calls by Agent")
-    st.bar_chart(df["voice_agent_name"].value_counts())
+    st.bar_chart(stats["calls_by_agent"])
     st.markdown("#### 🎯 Conversion Probabilities")
-    st.line_chart(pd.to_numeric(df["conversion_probability"], errors="coerce"))
+    st.line_chart(df["conversion_probability"])
     st.markdown("#### 📅 Calls per Day")
-    calls_by_date = df.groupby("call_date")["call_id"].count()
+    calls_by_date = stats["calls_by_date"]
     if not calls_by_date.empty:
         st.area_chart(calls_by_date)
     else:
@@ -148,17 +393,17 @@ with tab3:
     if filtered_df.empty:
         st.info("No results for these filters.")
     else:
-        for idx, row in filtered_df.iterrows():
-            with st.expander(f"📞 {row['call_id']} - {row['customer_name']} ({row['call_date']})"):
-                st.write(f"**Agent:** {row['voice_agent_name']}")
-                st.write(f"**Outcome:** {row['call_outcome']} | **Success:** {row['call_success']}")
-                st.markdown(f"**Summary:** {row['summary']}")
-                st.markdown(f"**Action Items:** {row['action_items']}")
-                if row["transcript"]:
-                    st.markdown("**Transcript Preview:**")
-                    st.text(row["transcript"][:1500] + " ...")
-                else:
-                    st.info("No transcript found for this call.")
+        # One virtualized table instead of an expander per call
+        st.dataframe(
+            filtered_df[INSIGHT_COLUMNS],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "summary": st.column_config.TextColumn("Summary", width="large"),
+                "action_items": st.column_config.TextColumn("Action Items", width="medium"),
+                "transcript": st.column_config.TextColumn("Transcript", width="large"),
+            }
+        )
 
 with tab4:
     st.subheader("🔊 Audio Recordings: Universal Format Support")
@@ -167,35 +412,23 @@ with tab4:
         "Browser support depends on file type. For best experience, use direct URLs."
     )
 
-    audiocount = 0
-    for idx, row in filtered_df.iterrows():
-        url = str(row["call_recording_url"]).strip()
-        if url:
-            audiocount += 1
-            filename = url.split("/")[-1] if "/" in url else url
-            ext = filename.split(".")[-1].lower() if "." in filename else None
-            icon = AUDIO_FORMAT_ICONS.get(ext, "🎧")
-            st.markdown(f"---\n**{icon} {row['call_id']} — {row['customer_name']}**")
-            st.write(f"**Audio file:** `{filename}` | **Format:** `{ext or 'Unknown'}`")
-
-            # Attempt st.audio play, fallback to clickable link
-            if ext in SUPPORTED_AUDIO_EXTS or ext is None:  # Try anyway; browsers may support more
-                try:
-                    st.audio(url)
-                except Exception as e:
-                    st.warning(f"Could not play audio in-app: {e}")
-                    st.markdown(f"[Play/download manually]({url})")
-            else:
-                st.warning(f"Audio file appears to be an unsupported format: `{ext}`. [Manual link]({url})")
-
-            # Transcript preview if available
-            if row["transcript"]:
-                with st.expander("📝 Transcript Preview"):
-                    st.text(row["transcript"][:1000] + ("..." if len(row["transcript"])>1000 else ""))
-            st.caption("Supported: mp3, wav, ogg, flac, aac, m4a, webm, oga & more by browser. "
-                       "If playback fails, try manual download.")
-    if audiocount == 0:
+    # Derive URL, file name and format for every recording in whole-column string ops
+    urls = filtered_df["call_recording_url"].astype(str).str.strip()
+    rec_df = filtered_df.loc[urls != "", ["call_id", "customer_name", "transcript"]].assign(url=urls[urls != ""])
+    rec_df["filename"] = rec_df["url"].str.rsplit("/", n=1).str[-1]
+    rec_df["ext"] = rec_df["filename"].str.extract(r"\.([^.]*)$", expand=False).str.lower()
+    rec_df["format"] = rec_df["ext"].map(AUDIO_FORMAT_ICONS).fillna("🎧") + " " + rec_df["ext"].fillna("Unknown")
+    if rec_df.empty:
         st.info("No recordings found in filtered results.")
+    else:
+        st.dataframe(
+            rec_df[["call_id", "customer_name", "filename", "format", "url"]],
+            use_container_width=True,
+            hide_index=True,
+            column_config={"url": st.column_config.LinkColumn("Recording")}
+        )
+
+        recording_player(rec_df)
 
 st.success("✅ Dashboard loaded. Explore all calls, deep analytics, summaries, and play recordings of any major audio format!")
 
@@ -2,27 +2,32 @@ import streamlit as st
 import os
 from datetime import datetime, timedelta
 
+def build_default_config():
+    """Build the default configuration from the environment"""
+    return {
+        "app_name": "Business Management Suite",
+        "version": "2.0.0",
+        "debug": os.getenv("DEBUG", "False").lower() == "true",
+        "session_timeout": 30,  # minutes
+        "max_file_size": 10,  # MB
+        "supported_formats": ["csv", "xlsx", "json"],
+        "api_endpoints": {
+            "vapi": os.getenv("VAPI_API_URL", "https://api.vapi.ai"),
+            "n8n": os.getenv("N8N_WEBHOOK_URL", ""),
+        },
+        "features": {
+            "voice_calls": True,
+            "ai_chat": True,
+            "real_time_sync": True,
+            "notifications": True,
+        }
+    }
+
 def load_config():
     """Load application configuration"""
     if "config" not in st.session_state:
-        st.session_state.config = {
-            "app_name": "Business Management Suite",
-            "version": "2.0.0",
-            "debug": os.getenv("DEBUG", "False").lower() == "true",
-            "session_timeout": 30,  # minutes
-            "max_file_size": 10,  # MB
-            "supported_formats": ["csv", "xlsx", "json"],
-            "api_endpoints": {
-                "vapi": os.getenv("VAPI_API_URL", "https://api.vapi.ai"),
-                "n8n": os.getenv("N8N_WEBHOOK_URL", ""),
-            },
-            "features": {
-                "voice_calls": True,
-                "ai_chat": True,
-                "real_time_sync": True,
-                "notifications": True,
-            }
-        }
+        # Built once per session; a fresh dict, so per-session edits never leak between sessions
+        st.session_state.config = build_default_config()
 
 def init_session_state():
     """Initialize session state variables"""